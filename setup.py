@@ -61,11 +61,23 @@ setup(
         ],
         "web": [
             "flask>=2.0.0",
+            "gunicorn>=20.1.0",
+            "waitress>=2.1.0",
         ],
         "visualization": [
             "matplotlib>=3.5.0",
             "seaborn>=0.11.0",
         ],
+        "large-plots": [
+            "datashader>=0.14.0",
+            "pandas>=1.3.0",
+            "vispy>=0.12.0",
+        ],
+        "performance": [
+            "numba>=0.57.0",
+            "orjson>=3.6.0",
+            "scipy>=1.8.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -29,7 +29,7 @@ def main(argv: Optional[list] = None) -> int:
     parser = argparse.ArgumentParser(description='IoT Network Management CLI')
     parser.add_argument('n_nodes', type=int, help='Number of nodes to generate')
     parser.add_argument('-o', '--output', default='network.json',
-                       help='Output filename (default: network.json)')
+                       help='Output filename; a .npz extension writes the compact binary format (default: network.json)')
     parser.add_argument('-w', '--width', type=float, default=1000.0,
                        help='Map width (default: 1000.0)')
     parser.add_argument('--height', type=float, default=1000.0,
@@ -2,9 +2,10 @@
 IoT Network Generator: Utility to create random IoT networks.
 """
 
-import random
 from typing import Optional
 
+import numpy as np
+
 from .network import IoTNetwork
 from .node import IoTNode
 from ..utils.logging_config import get_logger
@@ -30,28 +31,24 @@ def generate_random_network(n_nodes: int,
     Returns:
         IoTNetwork with randomly placed nodes
     """
-    if seed is not None:
-        random.seed(seed)
-    
-    network = IoTNetwork()
+    # One generator drives identifiers, positions and ranges
+    rng = np.random.default_rng(seed)
     
     logger.info("Generating %d random IoT nodes", n_nodes)
     logger.info("Map dimensions: %.1f x %.1f", map_width, map_height)
     logger.info("Communication range: up to %.1f", max_range)
     
-    # Generate nodes with random positions and ranges
-    for i in range(n_nodes):
-        x = random.uniform(0, map_width)
-        y = random.uniform(0, map_height)
-        # Use a range from 30% to 100% of max_range for variety
-        comm_range = random.uniform(max_range * 0.3, max_range)
-        
-        # Create node with generated EUI-64
-        eui64 = IoTNode.generate_eui64()
-        network.add_node(eui64, x, y, comm_range)
-        
-        if (i + 1) % 100 == 0 or i == n_nodes - 1:
-            logger.debug("Generated %d/%d nodes", i + 1, n_nodes)
+    # Draw all EUI-64 identifiers up front in one batch
+    eui64s = IoTNode.generate_eui64_batch(n_nodes, rng=rng)
+    
+    # Generate random positions and ranges as whole arrays
+    xs = rng.uniform(0, map_width, n_nodes)
+    ys = rng.uniform(0, map_height, n_nodes)
+    # Use a range from 30% to 100% of max_range for variety
+    ranges = rng.uniform(max_range * 0.3, max_range, n_nodes)
+    
+    # Insert all nodes in one bulk operation
+    network = IoTNetwork.from_arrays(eui64s, xs, ys, ranges, connect=False)
     
     # Update all connections based on positions and ranges
     logger.info("Calculating node connections")
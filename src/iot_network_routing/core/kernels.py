@@ -0,0 +1,185 @@
+"""
+Optional Numba-compiled kernels for the numeric hot loops.
+
+Numba is an optional dependency. When it is not installed NUMBA_AVAILABLE is
+False and callers fall back to their NumPy or pure-Python implementations.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit
+    def _count_row(i, xs, ys, ranges_sq):
+        """Count the neighbors j > i of node i."""
+        xi = xs[i]
+        yi = ys[i]
+        ri_sq = ranges_sq[i]
+        count = 0
+        for j in range(i + 1, xs.shape[0]):
+            dx = xi - xs[j]
+            dy = yi - ys[j]
+            if dx * dx + dy * dy <= max(ri_sq, ranges_sq[j]):
+                count += 1
+        return count
+
+    @njit
+    def _fill_row(i, xs, ys, ranges_sq, indices, distances, k):
+        """Write the neighbors j > i of node i starting at offset k."""
+        xi = xs[i]
+        yi = ys[i]
+        ri_sq = ranges_sq[i]
+        for j in range(i + 1, xs.shape[0]):
+            dx = xi - xs[j]
+            dy = yi - ys[j]
+            dist_sq = dx * dx + dy * dy
+            if dist_sq <= max(ri_sq, ranges_sq[j]):
+                indices[k] = j
+                distances[k] = np.sqrt(dist_sq)
+                k += 1
+
+    @njit(parallel=True)
+    def build_adjacency(xs, ys, ranges_sq):
+        """
+        Find connected node pairs and return them as upper-triangular CSR arrays.
+
+        Runs two passes over the upper triangle: the first counts each row's
+        connections, the second writes neighbor indices and distances at the
+        row offsets. No N x N temporary is allocated.
+
+        Rows are independent, so both passes run in parallel. Upper-triangle
+        rows shrink as i grows; each iteration handles row k together with
+        row n - 1 - k so every iteration does about the same amount of work.
+
+        Args:
+            xs: X coordinates (float64) indexed by node position
+            ys: Y coordinates (float64) indexed by node position
+            ranges_sq: Squared communication ranges (float64) indexed by node position
+
+        Returns:
+            Tuple of (indptr, indices, distances) where row i lists its
+            neighbors j > i in indices[indptr[i]:indptr[i + 1]]
+        """
+        n_nodes = xs.shape[0]
+        half = (n_nodes + 1) // 2
+        counts = np.zeros(n_nodes, dtype=np.int64)
+        for k in prange(half):
+            counts[k] = _count_row(k, xs, ys, ranges_sq)
+            mirror = n_nodes - 1 - k
+            if mirror != k:
+                counts[mirror] = _count_row(mirror, xs, ys, ranges_sq)
+
+        indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(counts)
+        indices = np.empty(indptr[n_nodes], dtype=np.int64)
+        distances = np.empty(indptr[n_nodes], dtype=np.float64)
+
+        # Each row writes only its own indptr slice, so rows never overlap
+        for k in prange(half):
+            _fill_row(k, xs, ys, ranges_sq, indices, distances, indptr[k])
+            mirror = n_nodes - 1 - k
+            if mirror != k:
+                _fill_row(mirror, xs, ys, ranges_sq, indices, distances, indptr[mirror])
+
+        return indptr, indices, distances
+
+    @njit
+    def _bfs_row(indptr, indices, source, hops, previous, queue):
+        """Breadth-first search from source, filling one row of hops and previous."""
+        hops[source] = 0
+        head = 0
+        tail = 1
+        queue[0] = source
+        while head < tail:
+            current = queue[head]
+            head += 1
+            next_hops = hops[current] + 1
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if hops[neighbor] < 0:
+                    hops[neighbor] = next_hops
+                    previous[neighbor] = current
+                    queue[tail] = neighbor
+                    tail += 1
+
+    @njit(parallel=True)
+    def all_pairs_bfs(indptr, indices):
+        """
+        Run a breadth-first search from every node over CSR adjacency.
+
+        Sources are independent and each writes only its own row, so they run
+        in parallel without locks. Each row of order doubles as that source's
+        BFS queue, so it ends up holding the nodes in discovery order.
+
+        Args:
+            indptr: CSR row offsets, length N + 1
+            indices: CSR neighbor positions
+
+        Returns:
+            Tuple of (hops, previous, order) int32 arrays of shape (N, N); row s
+            holds the hop count from s and the BFS predecessor of each node, with
+            -1 for unreachable nodes (and for the predecessor of s itself), and
+            the reached nodes in discovery order (s first) followed by -1 padding
+        """
+        n_nodes = indptr.shape[0] - 1
+        hops = np.full((n_nodes, n_nodes), -1, dtype=np.int32)
+        previous = np.full((n_nodes, n_nodes), -1, dtype=np.int32)
+        order = np.full((n_nodes, n_nodes), -1, dtype=np.int32)
+        for source in prange(n_nodes):
+            _bfs_row(indptr, indices, source, hops[source], previous[source], order[source])
+        return hops, previous, order
+
+    @njit(boundscheck=False)
+    def fill_ascii_grid(xs, ys, degrees, min_x, span_x, min_y, span_y, width, height):
+        """
+        Place nodes on a character grid for the ASCII map.
+
+        Each node's offset from (min_x, min_y) is divided by the span and scaled to
+        the grid, clamped, and the cell is set to the node's connectivity symbol;
+        later nodes overwrite earlier ones sharing a cell.
+
+        Returns:
+            uint8 array of shape (height, width) holding ASCII codes, row 0 at
+            the minimum y
+        """
+        grid = np.full((height, width), 32, dtype=np.uint8)
+        cells_x = width - 1
+        cells_y = height - 1
+        for i in range(xs.shape[0]):
+            mx = min(max(int((xs[i] - min_x) / span_x * cells_x), 0), cells_x)
+            my = min(max(int((ys[i] - min_y) / span_y * cells_y), 0), cells_y)
+            degree = degrees[i]
+            if degree == 0:
+                grid[my, mx] = 46   # '.'
+            elif degree <= 2:
+                grid[my, mx] = 111  # 'o'
+            elif degree <= 5:
+                grid[my, mx] = 79   # 'O'
+            else:
+                grid[my, mx] = 64   # '@'
+        return grid
+
+
+def warm_up() -> None:
+    """
+    Compile the kernels ahead of the first real call.
+
+    Numba compiles on first use, which can take several seconds. The kernels
+    are not cached on disk: Numba's cache records the importing module's name,
+    so a cache written under one import path (e.g. the tests' src.* imports)
+    breaks loading under another. Servers call this at startup instead, so the
+    first request does not pay the compile cost.
+    The dummy arrays match what IoTNetwork.update_all_connections passes in:
+    writable coordinate and squared-range arrays read from the graph.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    coords = np.zeros(2, dtype=np.float64)
+    build_adjacency(coords, coords, np.ones(2, dtype=np.float64))
@@ -2,12 +2,42 @@
 IoT Network management for collections of IoT nodes and their connections.
 """
 
-import json
-import math
-from typing import List, Dict, Optional
+import os
+import sys
+from concurrent.futures import Executor, Future
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, BinaryIO, Callable, Hashable, Iterable, Iterator, List, Dict, Mapping, Optional, Sequence, Tuple
 import networkx as nx
+import numpy as np
 
-from .node import IoTNode
+from .node import IoTNode, bump_graph_version
+from .serialization import dumps, load_json, loads
+from .spatial import pairs_within_range
+
+
+def _intern_id(node_id: Any) -> Any:
+    """Intern string node ids (str subclasses such as numpy.str_ become plain str); other ids pass through."""
+    if isinstance(node_id, str):
+        return sys.intern(str(node_id))
+    return node_id
+
+
+class VersionedCache:
+    """Memo of derived values that is emptied whenever the version it was filled under changes."""
+    
+    def __init__(self):
+        self._values: Dict[Hashable, Any] = {}
+        self._version: Hashable = None
+    
+    def get(self, version: Hashable, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the value stored under key, calling build() first if it is missing or version changed."""
+        if self._version != version:
+            self._values.clear()
+            self._version = version
+        if key not in self._values:
+            self._values[key] = build()
+        return self._values[key]
 
 
 class IoTNetwork:
@@ -15,24 +45,183 @@ class IoTNetwork:
     
     def __init__(self):
         self.graph = nx.Graph()  # NetworkX undirected graph is the single source of truth
+        # Derived data (e.g. coordinate arrays) rebuilt lazily whenever cache_key changes
+        self._cache = VersionedCache()
+    
+    @property
+    def version(self) -> int:
+        """Mutation counter, bumped whenever nodes, positions, ranges or connections change."""
+        return self.graph.graph.get('version', 0)
+    
+    @property
+    def cache_key(self) -> Tuple[int, int, int]:
+        """
+        Key for memoized derived data: the version plus the node and edge counts.
+        
+        The counts catch nodes or edges added to or removed from self.graph directly,
+        which do not bump the version. Direct attribute edits (e.g. graph.nodes[id]['x'])
+        are only seen by update_all_connections, which reads positions from the graph.
+        """
+        return self.version, self.graph.number_of_nodes(), self.graph.number_of_edges()
+    
+    def _cached(self, key: str, build: Callable[[], Any]) -> Any:
+        """Return a derived value, rebuilding it if the network changed since it was cached."""
+        return self._cache.get(self.cache_key, key, build)
+    
+    def _node_attribute_array(self, attribute: str) -> np.ndarray:
+        """Collect one node attribute into a read-only float64 array ordered like node_ids."""
+        node_attrs = self.graph.nodes
+        values = np.fromiter((node_attrs[node_id][attribute] for node_id in self.node_ids),
+                             dtype=np.float64, count=len(node_attrs))
+        values.flags.writeable = False
+        return values
+    
+    @property
+    def node_ids(self) -> Tuple[str, ...]:
+        """EUI-64 identifiers in graph order; index i matches position i of the coordinate arrays."""
+        return self._cached('node_ids', lambda: tuple(self.graph.nodes()))
+    
+    @property
+    def xs(self) -> np.ndarray:
+        """X coordinates of all nodes as a contiguous array (structure-of-arrays view)."""
+        return self._cached('xs', lambda: self._node_attribute_array('x'))
+    
+    @property
+    def ys(self) -> np.ndarray:
+        """Y coordinates of all nodes as a contiguous array (structure-of-arrays view)."""
+        return self._cached('ys', lambda: self._node_attribute_array('y'))
+    
+    @property
+    def ranges(self) -> np.ndarray:
+        """Communication ranges of all nodes as a contiguous array (structure-of-arrays view)."""
+        return self._cached('ranges', lambda: self._node_attribute_array('communication_range'))
+    
+    @property
+    def node_index(self) -> Mapping[str, int]:
+        """Read-only map from EUI-64 identifier to its position in node_ids and the coordinate arrays."""
+        return self._cached('node_index', lambda: MappingProxyType(
+            {node_id: i for i, node_id in enumerate(self.node_ids)}))
+    
+    @property
+    def edge_index(self) -> np.ndarray:
+        """Connections as a read-only (E, 2) array of node positions, one row per edge."""
+        def build() -> np.ndarray:
+            index = self.node_index
+            edges = np.fromiter((index[node_id] for edge in self.graph.edges() for node_id in edge),
+                                dtype=np.intp, count=2 * self.graph.number_of_edges()).reshape(-1, 2)
+            edges.flags.writeable = False
+            return edges
+        return self._cached('edge_index', build)
+    
+    @property
+    def degrees(self) -> np.ndarray:
+        """Number of connections of each node as a read-only array ordered like node_ids."""
+        def build() -> np.ndarray:
+            counts = np.bincount(self.edge_index.ravel(), minlength=len(self.node_ids))
+            counts.flags.writeable = False
+            return counts
+        return self._cached('degrees', build)
+    
+    @property
+    def edge_weights(self) -> np.ndarray:
+        """Weight (distance) of each connection as a read-only array aligned with edge_index rows."""
+        def build() -> np.ndarray:
+            weights = np.fromiter((weight for _, _, weight in self.graph.edges(data='weight', default=np.nan)),
+                                  dtype=np.float64, count=self.graph.number_of_edges())
+            weights.flags.writeable = False
+            return weights
+        return self._cached('edge_weights', build)
+    
+    @property
+    def csr_adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Adjacency in compressed sparse row form as read-only (indptr, indices) arrays.
+        
+        The neighbors of node i are indices[indptr[i]:indptr[i + 1]], as positions into
+        node_ids and listed in the same order as graph.adj, so integer-based algorithms
+        visit neighbors exactly as the NetworkX graph would.
+        """
+        return self._csr()[:2]
+    
+    def _csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cached (indptr, indices, weights) arrays behind csr_adjacency and adjacency_matrix."""
+        def build() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            adj = self.graph.adj
+            index = self.node_index
+            node_ids = self.node_ids
+            counts = np.fromiter((len(adj[node_id]) for node_id in node_ids), dtype=np.intp, count=len(node_ids))
+            indptr = np.zeros(len(node_ids) + 1, dtype=np.intp)
+            np.cumsum(counts, out=indptr[1:])
+            indices = np.fromiter((index[neighbor_id] for node_id in node_ids for neighbor_id in adj[node_id]),
+                                  dtype=np.intp, count=int(indptr[-1]))
+            weights = np.fromiter((edge.get('weight', np.nan)
+                                   for node_id in node_ids for edge in adj[node_id].values()),
+                                  dtype=np.float64, count=int(indptr[-1]))
+            for array in (indptr, indices, weights):
+                array.flags.writeable = False
+            return indptr, indices, weights
+        return self._cached('csr', build)
+    
+    def adjacency_matrix(self, weighted: bool = False):
+        """
+        Build the symmetric adjacency matrix as a SciPy sparse CSR matrix.
+        
+        Rows and columns follow node_ids order. Memory grows with the number of
+        connections rather than N^2, and the result can be passed straight to
+        scipy.sparse.csgraph routines. Requires SciPy.
+        
+        Args:
+            weighted: Store connection distances instead of 1 for each link
+        
+        Returns:
+            scipy.sparse.csr_matrix of shape (N, N)
+        """
+        try:
+            from scipy import sparse
+        except ImportError as e:
+            raise ImportError("adjacency_matrix requires scipy "
+                              "(pip install iot-network-routing[performance])") from e
+        
+        indptr, indices, weights = self._csr()
+        data = weights if weighted else np.ones(len(indices), dtype=np.uint8)
+        n_nodes = len(self.node_ids)
+        return sparse.csr_matrix((data, indices, indptr), shape=(n_nodes, n_nodes))
     
     @property
     def nodes(self) -> List[IoTNode]:
         """Get all nodes as IoTNode views over the graph."""
         return [IoTNode(self.graph, node_id) for node_id in self.graph.nodes()]
     
+    def iter_nodes(self) -> Iterator[IoTNode]:
+        """Iterate over IoTNode views lazily, creating each view only when it is reached."""
+        for node_id in self.graph.nodes():
+            yield IoTNode(self.graph, node_id)
+    
     def get_node_by_eui64(self, eui64: str) -> Optional[IoTNode]:
         """Get node by EUI-64 identifier."""
         if eui64 in self.graph.nodes:
             return IoTNode(self.graph, eui64)
         return None
     
-    def add_node(self, eui64: str, x: float, y: float, communication_range: float) -> IoTNode:
-        """Add a node to the network and return IoTNode view."""
+    def add_node(self, eui64: str, x: float, y: float, communication_range: float,
+                 connect: bool = False) -> IoTNode:
+        """
+        Add a node to the network and return IoTNode view.
+        
+        With connect=True the new node is linked to every node in range right away
+        (see update_node_connections), so one-at-a-time insertion does not need a
+        full update_all_connections afterwards.
+        """
         if eui64 in self.graph.nodes:
             raise ValueError(f"Node {eui64} already exists in network")
-            
+        
+        # Intern identifiers so every reference to a node (graph keys, adjacency
+        # keys, loaded neighbor lists) shares one string object
+        eui64 = _intern_id(eui64)
         self.graph.add_node(eui64, x=x, y=y, communication_range=communication_range)
+        bump_graph_version(self.graph)
+        if connect:
+            self.update_node_connections(eui64)
         return IoTNode(self.graph, eui64)
     
     def remove_node(self, eui64: str) -> bool:
@@ -42,33 +231,100 @@ class IoTNetwork:
             
         # Remove from NetworkX graph (this automatically removes all edges)
         self.graph.remove_node(eui64)
+        bump_graph_version(self.graph)
         return True
     
     def update_all_connections(self) -> None:
         """Update all node connections based on current positions and ensure bidirectional connections."""
+        # Pair search works on positional indices into coordinate arrays read straight
+        # from the graph, so positions edited on self.graph directly are honoured too
+        node_data = self.graph.nodes(data=True)
+        node_ids = tuple(self.graph.nodes())
+        xs, ys, ranges = (np.fromiter((attrs[name] for _, attrs in node_data), dtype=np.float64,
+                                      count=len(node_ids))
+                          for name in ('x', 'y', 'communication_range'))
+        rows, cols, distances = pairs_within_range(xs, ys, ranges)
+
         # Clear all existing edges in the graph
         self.graph.clear_edges()
-        
-        # Create bidirectional connections using NetworkX
-        node_ids = list(self.graph.nodes())
-        for i, node1_id in enumerate(node_ids):
-            for node2_id in node_ids[i+1:]:
-                # Get node attributes from graph
-                node1_attrs = self.graph.nodes[node1_id]
-                node2_attrs = self.graph.nodes[node2_id]
-                
-                # Calculate distance
-                distance = math.sqrt((node1_attrs['x'] - node2_attrs['x'])**2 + 
-                                   (node1_attrs['y'] - node2_attrs['y'])**2)
-                
-                # Check if nodes can communicate (use the maximum range for broader connectivity)
-                max_range = max(node1_attrs['communication_range'], node2_attrs['communication_range'])
-                
-                if distance <= max_range:
-                    # Add edge to NetworkX graph with distance as weight
-                    self.graph.add_edge(node1_id, node2_id, weight=distance)
-    
-    
+
+        # Nodes can communicate within the maximum of their two ranges (broader connectivity);
+        # edges are inserted in one bulk call with distance as weight
+        self.graph.add_weighted_edges_from(
+            (node_ids[i], node_ids[j], distance)
+            for i, j, distance in zip(rows.tolist(), cols.tolist(), distances.tolist())
+        )
+        bump_graph_version(self.graph)
+
+    def update_node_connections(self, eui64: str) -> int:
+        """
+        Recompute the connections of a single node, leaving all other links untouched.
+
+        Use after adding or moving one node instead of a full update_all_connections.
+        The node is checked against every other node in one vectorized pass, so the
+        cost is O(N) rather than the O(N^2) of a full rebuild.
+
+        Args:
+            eui64: Identifier of the node to reconnect
+
+        Returns:
+            Number of connections the node has afterwards
+        """
+        if eui64 not in self.graph.nodes:
+            raise ValueError(f"Node {eui64} not found in network")
+
+        attrs = self.graph.nodes[eui64]
+        dx = self.xs - attrs['x']
+        dy = self.ys - attrs['y']
+        dist_sq = dx * dx + dy * dy
+        # Same rule as update_all_connections: within the larger of the two ranges
+        reach = np.maximum(self.ranges, attrs['communication_range'])
+        within = np.flatnonzero(dist_sq <= reach * reach)
+
+        node_ids = self.node_ids
+        self.graph.remove_edges_from(list(self.graph.edges(eui64)))
+        for index, distance in zip(within.tolist(), np.sqrt(dist_sq[within]).tolist()):
+            other_id = node_ids[index]
+            if other_id != eui64:
+                self.graph.add_edge(eui64, other_id, weight=distance)
+        bump_graph_version(self.graph)
+        return self.graph.degree(eui64)
+
+    def update_connections(self, eui64s: Iterable[str]) -> None:
+        """
+        Recompute the connections of a batch of added or moved nodes.
+
+        Small batches are patched one node at a time with update_node_connections;
+        once the batch grows past sqrt(N) nodes a single update_all_connections is
+        cheaper, so the whole graph is rebuilt instead. Either way the result
+        matches a full rebuild.
+
+        Args:
+            eui64s: Identifiers of the nodes whose position or range changed
+        """
+        dirty = list(dict.fromkeys(eui64s))
+        for eui64 in dirty:
+            if eui64 not in self.graph.nodes:
+                raise ValueError(f"Node {eui64} not found in network")
+
+        if len(dirty) * len(dirty) > len(self.graph):
+            self.update_all_connections()
+            return
+        for eui64 in dirty:
+            self.update_node_connections(eui64)
+
+    def validate_bidirectional_connections(self) -> bool:
+        """
+        Check that every connection is recorded on both of its endpoints.
+
+        Each adjacency entry is verified with one hash lookup and the scan stops at
+        the first one-sided link, so the check is O(E).
+        """
+        adj = self.graph.adj
+        return not any(node_id not in adj[neighbor_id]
+                       for node_id, neighbors in adj.items()
+                       for neighbor_id in neighbors)
+
     def get_connection_count(self) -> int:
         """Get total number of connections in the network."""
         return self.graph.number_of_edges()
@@ -86,40 +342,207 @@ class IoTNetwork:
             'total_connections': self.get_connection_count()
         }
     
-    def save_to_file(self, filename: str) -> None:
-        """Save network to JSON file."""
-        with open(filename, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+    def save_to_file(self, filename: str, pretty: bool = True) -> None:
+        """Save network to JSON file (indented unless pretty is False), or to NPZ if filename ends in .npz."""
+        if os.fspath(filename).endswith('.npz'):
+            self.save_npz(filename)
+            return
+        with open(filename, 'wb') as f:
+            f.writelines(self._iter_json_chunks(pretty))
+    
+    def save_to_file_async(self, filename: str, executor: Executor, pretty: bool = True) -> Future:
+        """
+        Save network like save_to_file, finishing the write on an executor.
+        
+        The network is captured before this returns: JSON is encoded up front and
+        NPZ output uses the immutable cached arrays, so the caller can keep changing
+        the network while the file is compressed and written in the background.
+        
+        Args:
+            filename: Output path; a .npz extension selects the NPZ format
+            executor: Executor that performs the write, e.g. a ThreadPoolExecutor
+            pretty: Indent JSON output
+        
+        Returns:
+            Future that completes when the file has been written
+        """
+        if os.fspath(filename).endswith('.npz'):
+            return executor.submit(np.savez_compressed, filename, **self._npz_arrays())
+        data = b''.join(self._iter_json_chunks(pretty))
+        return executor.submit(Path(filename).write_bytes, data)
+    
+    def _iter_json_chunks(self, pretty: bool) -> Iterator[bytes]:
+        """
+        Encode the to_dict() document one node at a time.
+        
+        Produces the same bytes as dumps(self.to_dict(), pretty) without holding the
+        whole nested structure in memory; node records are read straight from the
+        graph instead of through IoTNode views.
+        """
+        # Node objects sit two levels deep, so their pretty-printed lines get four more spaces
+        node_prefix = b'\n    ' if pretty else b''
+        node_attrs = self.graph.nodes
+        adj = self.graph.adj
+        
+        yield b'{\n  "nodes": [' if pretty else b'{"nodes":['
+        for position, node_id in enumerate(self.graph.nodes()):
+            attrs = node_attrs[node_id]
+            record = dumps({
+                'eui64': node_id,
+                'x': attrs['x'],
+                'y': attrs['y'],
+                'communication_range': attrs['communication_range'],
+                'neighbors': list(adj[node_id])
+            }, pretty=pretty)
+            if pretty:
+                record = record.replace(b'\n', node_prefix)
+            yield (b',' if position else b'') + node_prefix + record
+        yield b'\n  ],' if pretty and len(self.graph) else b'],'
+        
+        # Reuse the encoder for the trailing counters, dropping its opening brace
+        yield dumps({
+            'total_nodes': len(self.graph.nodes),
+            'total_connections': self.get_connection_count()
+        }, pretty=pretty)[1:]
     
     @classmethod
     def load_from_file(cls, filename: str) -> 'IoTNetwork':
-        """Load network from JSON file."""
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        """Load network from JSON file, or from NPZ if filename ends in .npz."""
+        if os.fspath(filename).endswith('.npz'):
+            return cls.load_npz(filename)
+        return cls.from_dict(load_json(filename))
+    
+    def save_npz(self, filename: str) -> None:
+        """
+        Save network to a compressed NumPy archive.
+        
+        Nodes are stored as parallel arrays (eui64, xs, ys, ranges) and
+        connections as an (E, 2) array of node positions with their weights,
+        which is far smaller and faster to load than JSON for large networks.
+        
+        Args:
+            filename: Path of the .npz file to write
+        """
+        np.savez_compressed(filename, **self._npz_arrays())
+    
+    def _npz_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays stored in an NPZ file, keyed by their archive names."""
+        return {
+            'eui64': np.array(self.node_ids, dtype=str),
+            'xs': self.xs,
+            'ys': self.ys,
+            'ranges': self.ranges,
+            'edges': self.edge_index,
+            'weights': self.edge_weights
+        }
+    
+    @classmethod
+    def load_npz(cls, filename: str) -> 'IoTNetwork':
+        """Load network from a compressed NumPy archive written by save_npz."""
+        with np.load(filename, allow_pickle=False) as data:
+            network = cls.from_arrays(data['eui64'].tolist(), data['xs'], data['ys'], data['ranges'],
+                                      connect=False)
+            edges = data['edges'].tolist()
+            weights = data['weights'].tolist()
+        
+        node_ids = network.node_ids
+        network.graph.add_weighted_edges_from(
+            (node_ids[i], node_ids[j], weight) for (i, j), weight in zip(edges, weights)
+        )
+        bump_graph_version(network.graph)
+        return network
+    
+    @classmethod
+    def load_from_stream(cls, stream: BinaryIO) -> 'IoTNetwork':
+        """Load network from an open binary stream (e.g. an uploaded file) without touching disk."""
+        return cls.from_dict(loads(stream.read()))
+    
+    @classmethod
+    def from_arrays(cls,
+                    eui64s: Sequence[str],
+                    xs: Sequence[float],
+                    ys: Sequence[float],
+                    ranges: Sequence[float],
+                    connect: bool = True) -> 'IoTNetwork':
+        """
+        Build a network from parallel per-node sequences in one bulk insertion.
+
+        Args:
+            eui64s: Node identifiers
+            xs: X coordinates, aligned with eui64s
+            ys: Y coordinates, aligned with eui64s
+            ranges: Communication ranges, aligned with eui64s
+            connect: Compute connections from positions and ranges afterwards
+
+        Returns:
+            IoTNetwork containing the given nodes
+        """
+        if not len(eui64s) == len(xs) == len(ys) == len(ranges):
+            raise ValueError("Node identifier, coordinate and range sequences must have equal length")
         
         network = cls()
+        # Store plain Python floats so node attributes look the same as with add_node
+        xs = np.asarray(xs, dtype=np.float64).tolist()
+        ys = np.asarray(ys, dtype=np.float64).tolist()
+        ranges = np.asarray(ranges, dtype=np.float64).tolist()
+        network.graph.add_nodes_from(
+            (_intern_id(eui64), {'x': x, 'y': y, 'communication_range': communication_range})
+            for eui64, x, y, communication_range in zip(eui64s, xs, ys, ranges)
+        )
+        if network.graph.number_of_nodes() != len(eui64s):
+            raise ValueError("Duplicate node identifiers in input")
+        bump_graph_version(network.graph)
         
-        # First pass: create all nodes
-        for node_data in data['nodes']:
-            network.add_node(
-                eui64=node_data['eui64'],
-                x=node_data['x'],
-                y=node_data['y'],
-                communication_range=node_data['communication_range']
-            )
-        
-        # Second pass: establish connections
+        if connect:
+            network.update_all_connections()
+        return network
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'IoTNetwork':
+        """Build a network from the dictionary format produced by to_dict."""
+        network = cls()
+        
+        # First pass: create all nodes in one bulk insertion (values kept as stored in the file)
+        network.graph.add_nodes_from(
+            (_intern_id(node_data['eui64']), {'x': node_data['x'],
+                                              'y': node_data['y'],
+                                              'communication_range': node_data['communication_range']})
+            for node_data in data['nodes']
+        )
+        if network.graph.number_of_nodes() != len(data['nodes']):
+            raise ValueError("Duplicate node identifiers in network data")
+        bump_graph_version(network.graph)
+        
+        # Second pass: reconcile neighbor lists into undirected connections.
+        # A link may be listed from one or both ends, so collect each
+        # unordered pair once in a dict (which, unlike a set, keeps file order)
+        # instead of probing the graph per entry.
+        node_attrs = network.graph.nodes
+        links = {}
         for node_data in data['nodes']:
-            node_id = node_data['eui64']
+            node_id = _intern_id(node_data['eui64'])
             for neighbor_eui64 in node_data['neighbors']:
-                if neighbor_eui64 in network.graph.nodes:
-                    if not network.graph.has_edge(node_id, neighbor_eui64):
-                        # Calculate distance and add edge
-                        node1_attrs = network.graph.nodes[node_id]
-                        node2_attrs = network.graph.nodes[neighbor_eui64]
-                        distance = math.sqrt((node1_attrs['x'] - node2_attrs['x'])**2 + 
-                                           (node1_attrs['y'] - node2_attrs['y'])**2)
-                        network.graph.add_edge(node_id, neighbor_eui64, weight=distance)
+                # Interned ids reuse the graph's key objects instead of the decoder's copies
+                neighbor_eui64 = _intern_id(neighbor_eui64)
+                if neighbor_eui64 in node_attrs:
+                    if node_id < neighbor_eui64:
+                        links[node_id, neighbor_eui64] = None
+                    else:
+                        links[neighbor_eui64, node_id] = None
+
+        # Compute all link distances in one vectorized pass, then insert the edges in bulk
+        index = network.node_index
+        ends = np.fromiter((index[node_id] for link in links for node_id in link),
+                           dtype=np.intp, count=2 * len(links)).reshape(-1, 2)
+        xs, ys = network.xs, network.ys
+        dx = xs[ends[:, 0]] - xs[ends[:, 1]]
+        dy = ys[ends[:, 0]] - ys[ends[:, 1]]
+        distances = np.sqrt(dx * dx + dy * dy).tolist()
+        network.graph.add_weighted_edges_from(
+            (node_id, neighbor_eui64, distance)
+            for (node_id, neighbor_eui64), distance in zip(links, distances)
+        )
+        bump_graph_version(network.graph)
         
         return network
     
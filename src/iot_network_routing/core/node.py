@@ -6,17 +6,25 @@ import random
 import math
 from typing import List, Dict, Optional, TYPE_CHECKING
 import networkx as nx
+import numpy as np
 
 if TYPE_CHECKING:
     from .network import IoTNetwork
 
 
+def bump_graph_version(graph: nx.Graph) -> None:
+    """Record a change to graph data so cached derived arrays get rebuilt."""
+    graph.graph['version'] = graph.graph.get('version', 0) + 1
+
+
 class IoTNode:
     """
     Represents an IoT node as a view over NetworkX graph data.
     Uses IEEE EUI-64 identifier format.
     """
     
+    __slots__ = ('_graph', '_eui64', '_attrs')
+    
     def __init__(self, graph: nx.Graph, eui64: str):
         """
         Initialize IoT node as a view over NetworkX graph data.
@@ -25,18 +33,41 @@ class IoTNode:
             graph: NetworkX graph containing this node
             eui64: IEEE EUI-64 identifier for this node
         """
-        if eui64 not in graph.nodes:
-            raise ValueError(f"Node {eui64} not found in graph")
+        try:
+            # Keep the node's attribute dict itself, so property reads are a single lookup
+            self._attrs = graph.nodes[eui64]
+        except KeyError:
+            raise ValueError(f"Node {eui64} not found in graph") from None
         self._graph = graph
         self._eui64 = eui64
     
     @staticmethod
     def generate_eui64() -> str:
         """Generate a random IEEE EUI-64 identifier."""
-        # Generate 8 bytes (64 bits) of random data
-        bytes_data = [random.randint(0, 255) for _ in range(8)]
+        # Draw 8 bytes (64 bits) in one call; uses the `random` module so seeding stays reproducible
+        bytes_data = random.getrandbits(64).to_bytes(8, 'big')
         # Format as EUI-64 (XX-XX-XX-XX-XX-XX-XX-XX)
-        return '-'.join(f'{b:02X}' for b in bytes_data)
+        return bytes_data.hex('-').upper()
+    
+    @staticmethod
+    def generate_eui64_batch(count: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+        """
+        Generate `count` random IEEE EUI-64 identifiers from a single random draw.
+        
+        Args:
+            count: Number of identifiers to generate
+            rng: NumPy generator to draw from; defaults to the `random` module
+        
+        Returns:
+            List of formatted EUI-64 identifiers
+        """
+        if count <= 0:
+            return []
+        if rng is not None:
+            bytes_data = rng.bytes(8 * count)
+        else:
+            bytes_data = random.getrandbits(64 * count).to_bytes(8 * count, 'big')
+        return [bytes_data[i:i + 8].hex('-').upper() for i in range(0, 8 * count, 8)]
     
     @property
     def eui64(self) -> str:
@@ -46,49 +77,68 @@ class IoTNode:
     @property
     def x(self) -> float:
         """X coordinate on 2D map."""
-        return self._graph.nodes[self._eui64]['x']
+        return self._attrs['x']
     
     @x.setter
     def x(self, value: float) -> None:
         """Set X coordinate."""
-        self._graph.nodes[self._eui64]['x'] = value
+        self._attrs['x'] = value
+        bump_graph_version(self._graph)
     
     @property
     def y(self) -> float:
         """Y coordinate on 2D map."""
-        return self._graph.nodes[self._eui64]['y']
+        return self._attrs['y']
     
     @y.setter
     def y(self, value: float) -> None:
         """Set Y coordinate."""
-        self._graph.nodes[self._eui64]['y'] = value
+        self._attrs['y'] = value
+        bump_graph_version(self._graph)
     
     @property
     def communication_range(self) -> float:
         """Maximum communication range in units."""
-        return self._graph.nodes[self._eui64]['communication_range']
+        return self._attrs['communication_range']
     
     @communication_range.setter
     def communication_range(self, value: float) -> None:
         """Set communication range."""
-        self._graph.nodes[self._eui64]['communication_range'] = value
+        self._attrs['communication_range'] = value
+        bump_graph_version(self._graph)
     
     @property
     def neighbors(self) -> List['IoTNode']:
         """List of neighboring nodes (computed from graph)."""
-        neighbor_nodes = []
-        for neighbor_eui64 in self._graph.neighbors(self._eui64):
-            neighbor_nodes.append(IoTNode(self._graph, neighbor_eui64))
-        return neighbor_nodes
+        return [IoTNode(self._graph, neighbor_eui64) for neighbor_eui64 in self._graph.adj[self._eui64]]
+    
+    @property
+    def degree(self) -> int:
+        """Number of neighbors, read from the adjacency without building neighbor views."""
+        return len(self._graph.adj[self._eui64])
+    
+    def distance_sq_to(self, other: 'IoTNode') -> float:
+        """Calculate squared Euclidean distance to another node; use for comparisons."""
+        attrs = self._attrs
+        other_attrs = other._attrs
+        dx = attrs['x'] - other_attrs['x']
+        dy = attrs['y'] - other_attrs['y']
+        return dx * dx + dy * dy
     
     def distance_to(self, other: 'IoTNode') -> float:
         """Calculate Euclidean distance to another node."""
-        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
+        return math.sqrt(self.distance_sq_to(other))
     
     def can_communicate_with(self, other: 'IoTNode') -> bool:
         """Check if this node can communicate with another node based on range."""
-        return self.distance_to(other) <= self.communication_range
+        # Compare squared values so no square root is needed
+        reach = self._attrs['communication_range']
+        return self.distance_sq_to(other) <= reach * reach
     
+    def is_neighbor(self, other: 'IoTNode') -> bool:
+        """Check if another node is connected to this one (O(1) adjacency lookup)."""
+        return other.eui64 in self._graph.adj[self._eui64]
+
     def get_neighbor_eui64s(self) -> List[str]:
         """Get list of neighbor EUI-64 identifiers."""
         return list(self._graph.neighbors(self._eui64))
@@ -114,11 +164,12 @@ class IoTNode:
                           x=data['x'],
                           y=data['y'],
                           communication_range=data['communication_range'])
+            bump_graph_version(graph)
         
         return cls(graph, eui64)
     
     def __str__(self) -> str:
-        return f"IoTNode({self.eui64}, pos=({self.x:.1f}, {self.y:.1f}), range={self.communication_range}, neighbors={len(self.neighbors)})"
+        return f"IoTNode({self.eui64}, pos=({self.x:.1f}, {self.y:.1f}), range={self.communication_range}, neighbors={self.degree})"
     
     def __repr__(self) -> str:
         return self.__str__()
@@ -0,0 +1,140 @@
+"""
+JSON encoding helpers for network files.
+
+orjson is an optional dependency. When it is installed it handles encoding
+and decoding; otherwise the standard library json module is used. Both
+produce the same layout for network data, accept NumPy scalars and arrays,
+and write non-finite floats (inf, nan) as null.
+"""
+
+import json
+import math
+from typing import Any, Iterable, Union
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _encode_default(value: Any) -> Any:
+    """Convert NumPy scalars and arrays the encoders do not handle themselves."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _finite_or_null(value: Any) -> Any:
+    """Copy of value with non-finite floats replaced by None, matching orjson's output."""
+    if isinstance(value, (np.generic, np.ndarray)):
+        value = _encode_default(value)
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite_or_null(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite_or_null(item) for item in value]
+    return value
+
+
+def dumps(data: Any, pretty: bool = True) -> bytes:
+    """
+    Encode data as UTF-8 JSON bytes.
+
+    Non-string dict keys (e.g. integer degree counts) are written as strings,
+    as the standard library does. NumPy scalars and arrays are encoded as their
+    Python values, and inf/nan are written as null with either encoder.
+
+    Args:
+        data: JSON-compatible data to encode
+        pretty: Indent with two spaces; pass False for compact output
+
+    Returns:
+        Encoded JSON document
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_encode_default, option=option)
+    layout = {'indent': 2} if pretty else {'separators': (',', ':')}
+    try:
+        encoded = json.dumps(data, allow_nan=False, default=_encode_default, **layout)
+    except ValueError:
+        # Only documents holding inf or nan pay for the extra copy
+        encoded = json.dumps(_finite_or_null(data), allow_nan=False, default=_encode_default, **layout)
+    return encoded.encode('utf-8')
+
+
+def loads(raw: Union[bytes, str]) -> Any:
+    """Decode a JSON document; raises json.JSONDecodeError on malformed input."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def load_json(filename: str) -> Any:
+    """Read and decode a JSON file in one read."""
+    with open(filename, 'rb') as f:
+        return loads(f.read())
+
+
+def save_json(data: Any, filename: str, pretty: bool = True) -> None:
+    """Encode data and write it to a JSON file in one write."""
+    with open(filename, 'wb') as f:
+        f.write(dumps(data, pretty=pretty))
+
+
+def save_json_array(items: Iterable[Any], filename: str, pretty: bool = True) -> int:
+    """
+    Write items as a JSON array, encoding and writing one item at a time.
+
+    The file matches save_json(list(items), filename, pretty) byte for byte, but
+    the items are never held in memory together, so generators can be written
+    directly.
+
+    Args:
+        items: JSON-compatible values to write as array elements
+        filename: Path of the JSON file to write
+        pretty: Indent with two spaces; pass False for compact output
+
+    Returns:
+        Number of items written
+    """
+    # Array elements sit one level deep, so pretty-printed lines get two more spaces
+    prefix = b'\n  ' if pretty else b''
+    count = 0
+    with open(filename, 'wb') as f:
+        f.write(b'[')
+        for item in items:
+            encoded = dumps(item, pretty=pretty)
+            if pretty:
+                encoded = encoded.replace(b'\n', prefix)
+            f.write((b',' if count else b'') + prefix + encoded)
+            count += 1
+        f.write(b'\n]' if pretty and count else b']')
+    return count
+
+
+def save_ndjson(items: Iterable[Any], filename: str) -> int:
+    """
+    Write items as newline-delimited JSON, one compact document per line.
+
+    Args:
+        items: JSON-compatible values, one per line
+        filename: Path of the file to write
+
+    Returns:
+        Number of items written
+    """
+    count = 0
+    with open(filename, 'wb') as f:
+        for item in items:
+            f.write(dumps(item, pretty=False) + b'\n')
+            count += 1
+    return count
@@ -0,0 +1,245 @@
+"""
+Spatial indexing helpers for fixed-radius neighbor search between IoT nodes.
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+from .kernels import NUMBA_AVAILABLE
+
+if NUMBA_AVAILABLE:
+    from .kernels import build_adjacency
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Dense networks up to this size use the compiled all-pairs kernel when Numba
+# is installed; it stays fast even on dense maps where grid cells fill up.
+NUMBA_PAIR_LIMIT = 16384
+
+# Dense networks up to this size use the vectorized all-pairs check; larger
+# ones use a KD-tree when SciPy is installed and the spatial grid otherwise,
+# both of which avoid the O(N^2) comparisons.
+DENSE_PAIR_LIMIT = 2048
+
+# A map counts as dense when the mean range disc covers at least this share
+# of the bounding box, i.e. each node expects at least N / 256 neighbors.
+# Below it the KD-tree and grid searches, whose cost grows with the neighbor
+# count rather than N^2, beat the all-pairs checks at every size.
+DENSE_COVERAGE = 1 / 256
+
+# Rows compared per block in the vectorized check, bounding temporaries to
+# roughly _DENSE_BLOCK_ROWS * N elements.
+_DENSE_BLOCK_ROWS = 512
+
+# Cell offsets visited from each grid cell. Only the "forward" half of the
+# 3x3 neighborhood is scanned so every unordered pair of cells is seen once.
+_FORWARD_CELLS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def _cell_block_pairs(starts_a: np.ndarray,
+                      counts_a: np.ndarray,
+                      starts_b: np.ndarray,
+                      counts_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Enumerate every (a, b) member combination for a batch of cell pairs.
+
+    Cell members are stored contiguously, so each cell is a (start, count)
+    slice of the sorted node order. Returns positions into that order.
+    """
+    sizes = counts_a * counts_b
+    total = int(sizes.sum())
+    # Offset of each candidate inside its own cell pair
+    local = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    width = np.repeat(counts_b, sizes)
+    return np.repeat(starts_a, sizes) + local // width, np.repeat(starts_b, sizes) + local % width
+
+
+def grid_pairs(xs: np.ndarray,
+               ys: np.ndarray,
+               ranges_sq: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all node pairs within communication range using a uniform spatial grid.
+
+    Two nodes are connected when their distance does not exceed the larger of
+    their communication ranges. Nodes are bucketed into square cells whose side
+    equals the largest range, so only the 3x3 block of cells around a node can
+    hold candidates. Cells are built by sorting nodes on their cell key, and
+    candidate pairs for each neighbor offset are generated and tested with
+    NumPy rather than per-pair Python loops.
+
+    Args:
+        xs: X coordinates indexed by node position
+        ys: Y coordinates indexed by node position
+        ranges_sq: Squared communication ranges indexed by node position
+
+    Returns:
+        Tuple of (i, j, distance) arrays, one entry per connected pair with i < j
+    """
+    n_nodes = len(xs)
+    if n_nodes < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0, dtype=np.float64)
+
+    cell_size = math.sqrt(ranges_sq.max())
+    if cell_size <= 0:
+        # Only coincident nodes can connect; any positive cell size works
+        cell_size = 1.0
+
+    cell_x = np.floor(xs / cell_size).astype(np.int64)
+    cell_y = np.floor(ys / cell_size).astype(np.int64)
+    cell_x -= cell_x.min()
+    cell_y -= cell_y.min()
+    # Pad the key space by one column so the forward offsets never wrap rows
+    stride = int(cell_y.max()) + 2
+    keys = cell_x * stride + cell_y
+
+    order = np.argsort(keys, kind='stable')
+    cell_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+    pos_a, pos_b = [], []
+    # Pairs inside the same cell, keeping each unordered pair once
+    a, b = _cell_block_pairs(starts, counts, starts, counts)
+    keep = a < b
+    pos_a.append(a[keep])
+    pos_b.append(b[keep])
+
+    # Pairs spanning each cell and its forward neighbors
+    for ox, oy in _FORWARD_CELLS:
+        target = cell_keys + ox * stride + oy
+        found = np.searchsorted(cell_keys, target)
+        found[found == len(cell_keys)] = 0
+        hit = cell_keys[found] == target
+        a, b = _cell_block_pairs(starts[hit], counts[hit], starts[found[hit]], counts[found[hit]])
+        pos_a.append(a)
+        pos_b.append(b)
+
+    i = order[np.concatenate(pos_a)]
+    j = order[np.concatenate(pos_b)]
+    dx = xs[i] - xs[j]
+    dy = ys[i] - ys[j]
+    dist_sq = dx * dx + dy * dy
+    mask = dist_sq <= np.maximum(ranges_sq[i], ranges_sq[j])
+    rows = np.minimum(i[mask], j[mask])
+    cols = np.maximum(i[mask], j[mask])
+    dist_sq = dist_sq[mask]
+
+    # Same (i, j) order as the all-pairs strategies
+    order = np.lexsort((cols, rows))
+    return rows[order].astype(np.intp), cols[order].astype(np.intp), np.sqrt(dist_sq[order])
+
+
+def dense_pairs(xs: np.ndarray,
+                ys: np.ndarray,
+                ranges_sq: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all node pairs within communication range with NumPy broadcasting.
+
+    Compares every pair in compiled loops, processing a block of rows at a time
+    against the upper triangle so memory stays bounded for larger networks.
+
+    Args:
+        xs: X coordinates indexed by node position
+        ys: Y coordinates indexed by node position
+        ranges_sq: Squared communication ranges indexed by node position
+
+    Returns:
+        Tuple of (i, j, distance) arrays, one entry per connected pair with i < j
+    """
+    n_nodes = len(xs)
+    rows, cols, dists = [], [], []
+    for start in range(0, n_nodes, _DENSE_BLOCK_ROWS):
+        stop = min(start + _DENSE_BLOCK_ROWS, n_nodes)
+        # Only compare against columns from `start` onward (upper triangle)
+        dx = xs[start:stop, None] - xs[None, start:]
+        dy = ys[start:stop, None] - ys[None, start:]
+        dist_sq = dx * dx + dy * dy
+        mask = dist_sq <= np.maximum(ranges_sq[start:stop, None], ranges_sq[None, start:])
+        # Drop the diagonal and the lower triangle within this block
+        mask &= np.arange(start, n_nodes)[None, :] > np.arange(start, stop)[:, None]
+        block_rows, block_cols = np.nonzero(mask)
+        rows.append(block_rows + start)
+        cols.append(block_cols + start)
+        dists.append(np.sqrt(dist_sq[block_rows, block_cols]))
+
+    if not rows:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0, dtype=np.float64)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(dists)
+
+
+def kdtree_pairs(xs: np.ndarray,
+                 ys: np.ndarray,
+                 ranges_sq: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all node pairs within communication range with a SciPy KD-tree.
+
+    The tree returns every pair within the largest range in compiled code;
+    candidates are then filtered against each pair's own reach. Pairs are
+    sorted by (i, j) so edges are inserted in the same order as the all-pairs
+    strategies.
+
+    Args:
+        xs: X coordinates indexed by node position
+        ys: Y coordinates indexed by node position
+        ranges_sq: Squared communication ranges indexed by node position
+
+    Returns:
+        Tuple of (i, j, distance) arrays, one entry per connected pair with i < j
+    """
+    tree = cKDTree(np.column_stack([xs, ys]))
+    candidates = tree.query_pairs(r=math.sqrt(ranges_sq.max()), output_type='ndarray')
+    rows, cols = candidates[:, 0], candidates[:, 1]
+
+    dx = xs[rows] - xs[cols]
+    dy = ys[rows] - ys[cols]
+    dist_sq = dx * dx + dy * dy
+    mask = dist_sq <= np.maximum(ranges_sq[rows], ranges_sq[cols])
+    rows, cols, dist_sq = rows[mask], cols[mask], dist_sq[mask]
+
+    order = np.lexsort((cols, rows))
+    return rows[order].astype(np.intp), cols[order].astype(np.intp), np.sqrt(dist_sq[order])
+
+
+def _range_coverage(xs: np.ndarray, ys: np.ndarray, ranges_sq: np.ndarray) -> float:
+    """Share of the bounding box covered by a mean range disc (inf for empty or degenerate boxes)."""
+    if len(xs) == 0:
+        return math.inf
+    area = float(np.ptp(xs)) * float(np.ptp(ys))
+    if area == 0.0:
+        return math.inf
+    return math.pi * float(ranges_sq.mean()) / area
+
+
+def pairs_within_range(xs: np.ndarray,
+                       ys: np.ndarray,
+                       ranges: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all connected node pairs, choosing the strategy by network size and density.
+
+    Args:
+        xs: X coordinates indexed by node position
+        ys: Y coordinates indexed by node position
+        ranges: Communication ranges indexed by node position
+
+    Returns:
+        Tuple of (i, j, distance) arrays, one entry per connected unordered pair
+    """
+    n_nodes = len(xs)
+    # max(r1, r2)^2 == max(r1^2, r2^2), so square each range once up front
+    ranges_sq = ranges * ranges
+    if _range_coverage(xs, ys, ranges_sq) >= DENSE_COVERAGE:
+        if NUMBA_AVAILABLE and n_nodes <= NUMBA_PAIR_LIMIT:
+            indptr, cols, dists = build_adjacency(xs, ys, ranges_sq)
+            rows = np.repeat(np.arange(n_nodes), np.diff(indptr))
+            return rows, cols, dists
+        if n_nodes <= DENSE_PAIR_LIMIT:
+            return dense_pairs(xs, ys, ranges_sq)
+    if SCIPY_AVAILABLE:
+        return kdtree_pairs(xs, ys, ranges_sq)
+    return grid_pairs(xs, ys, ranges_sq)
@@ -25,8 +25,11 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
     
-    # Clear any existing handlers
-    root_logger.handlers.clear()
+    # Remove and close existing handlers so repeated calls neither duplicate
+    # output nor leak open log files
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
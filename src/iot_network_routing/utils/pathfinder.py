@@ -1,17 +1,132 @@
 import json
 import sys
 import argparse
+import threading
+import weakref
+import zipfile
+from collections import OrderedDict, deque
 import networkx as nx
-from typing import Dict, List, Tuple, Optional
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
+from ..core.kernels import NUMBA_AVAILABLE
 from ..core.network import IoTNetwork
+from ..core.serialization import save_json_array, save_ndjson
 from .logging_config import setup_logging, get_logger
 
+if NUMBA_AVAILABLE:
+    from ..core.kernels import all_pairs_bfs
+
 logger = get_logger(__name__)
 
+# Number of BFS predecessor maps kept per graph for find_shortest_path
+BFS_CACHE_SIZE = 64
+
+# Largest network whose path export runs on the all-pairs BFS kernel; its three
+# int32 N x N matrices take 12 * N^2 bytes, about 200 MB at this size
+HOP_MATRIX_MAX_NODES = 4096
+
+# Per-graph (graph version and size, LRU of source -> source entry); entries go away with the graph.
+# A source entry is (predecessor map or None, first destination, first path): a source queried
+# once holds only the path it returned; from its second query on it also holds its BFS tree.
+_bfs_cache: "weakref.WeakKeyDictionary[nx.Graph, Tuple[tuple, OrderedDict]]" = weakref.WeakKeyDictionary()
+_bfs_cache_lock = threading.Lock()
+
+
+def _bfs_predecessors(graph: nx.Graph, source_id: str) -> Dict[str, Optional[str]]:
+    """Map every node reachable from source_id to its BFS predecessor (None for the source)."""
+    adj = graph.adj
+    predecessors = {source_id: None}
+    queue = deque([source_id])
+    while queue:
+        current = queue.popleft()
+        for neighbor in adj[current]:
+            if neighbor not in predecessors:
+                predecessors[neighbor] = current
+                queue.append(neighbor)
+    return predecessors
+
+
+def _bidirectional_path(graph: nx.Graph, source_id: str, destination_id: str) -> Optional[List[str]]:
+    """Single-pair shortest path from a bidirectional BFS, or None if the nodes are not connected."""
+    try:
+        return nx.bidirectional_shortest_path(graph, source_id, destination_id)
+    except nx.NetworkXNoPath:
+        return None
+
+
+def _tree_path(predecessors: Dict[str, Optional[str]], source_id: str, destination_id: str) -> Optional[List[str]]:
+    """Walk a BFS predecessor map back from destination_id, or None if it is unreachable."""
+    if destination_id not in predecessors:
+        return None
+    path = [destination_id]
+    while path[-1] != source_id:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+
+def _trim_bfs_cache(entries: OrderedDict) -> None:
+    """Evict the least recently used sources beyond BFS_CACHE_SIZE; caller holds the lock."""
+    while len(entries) > BFS_CACHE_SIZE:
+        entries.popitem(last=False)
+
+
+def _cached_shortest_path(graph: nx.Graph, source_id: str, destination_id: str) -> Optional[List[str]]:
+    """Return a shortest path, reusing per-source results while the graph is unchanged.
+    
+    The first query from a source runs a bidirectional BFS, which meets in the middle
+    and explores far fewer nodes than a full search; its answer is remembered. From the
+    second query on, the source's whole BFS tree is built and cached, so further queries
+    only walk the path back from the destination. The remembered first answer is still
+    returned for its own destination, so a pair gets the same path on every call while
+    its source stays cached, even where several shortest paths tie.
+    
+    The cache is keyed on the graph version together with its node and edge counts, so
+    nodes or edges added to or removed from network.graph directly are also picked up.
+    A direct edit that leaves both counts unchanged (e.g. rewiring one edge) must be
+    followed by bump_graph_version(). Graphs without a version (not managed by
+    IoTNetwork) are never cached and always use the bidirectional search.
+    """
+    version = graph.graph.get('version')
+    if version is None:
+        return _bidirectional_path(graph, source_id, destination_id)
+    
+    key = (version, graph.number_of_nodes(), graph.number_of_edges())
+    with _bfs_cache_lock:
+        cached_key, entries = _bfs_cache.get(graph, (None, None))
+        if cached_key != key:
+            entries = OrderedDict()
+            _bfs_cache[graph] = (key, entries)
+        entry = entries.get(source_id)
+        if entry is not None:
+            entries.move_to_end(source_id)
+    
+    if entry is None:
+        path = _bidirectional_path(graph, source_id, destination_id)
+        entry = (None, destination_id, path)
+    else:
+        predecessors, first_destination, first_path = entry
+        if destination_id == first_destination:
+            return first_path
+        if predecessors is None:
+            predecessors = _bfs_predecessors(graph, source_id)
+            entry = (predecessors, first_destination, first_path)
+        path = _tree_path(predecessors, source_id, destination_id)
+    
+    with _bfs_cache_lock:
+        entries[source_id] = entry
+        entries.move_to_end(source_id)
+        _trim_bfs_cache(entries)
+    return path
+
 
 def find_shortest_path(graph: nx.Graph, source_id: str, destination_id: str) -> Tuple[Optional[List[str]], int]:
     """Find shortest path between two nodes.
     
+    A one-off query runs a bidirectional BFS; a source queried again gets its BFS tree
+    cached per graph version (see _cached_shortest_path). Repeated queries for the same
+    pair return the same path.
+    
     Returns:
         Tuple of (path, distance) where path is list of node IDs or None if no path exists,
         and distance is hop count or float('inf') if no path exists.
@@ -21,11 +136,10 @@ def find_shortest_path(graph: nx.Graph, source_id: str, destination_id: str) ->
     if destination_id not in graph:
         raise ValueError(f"Destination node {destination_id} not found in graph")
     
-    try:
-        path = nx.shortest_path(graph, source_id, destination_id)
-        return path, len(path) - 1
-    except nx.NetworkXNoPath:
+    path = _cached_shortest_path(graph, source_id, destination_id)
+    if path is None:
         return None, float('inf')
+    return path, len(path) - 1
 
 
 def calculate_paths_from_source(graph: nx.Graph, source_id: str) -> Dict[str, List[str]]:
@@ -76,28 +190,145 @@ def format_paths_for_export(all_paths: Dict[str, Dict[str, List[str]]]) -> List[
     return path_data
 
 
-def save_paths_to_file(path_data: List[Dict], output_file: str) -> None:
-    """Save path data to a JSON file."""
+def iter_path_entries(graph: nx.Graph) -> Iterator[Dict]:
+    """Yield export entries for all pairs without materializing every path.
+    
+    Runs one breadth-first search per source over the adjacency dict and records only
+    the hop count and predecessor of each reached node, so memory stays O(N) per source
+    instead of O(N) per path. Produces the same entries, in the same order, as
+    format_paths_for_export(calculate_all_shortest_paths(graph)).
+    
+    Yields:
+        Path entries with source, destination, distance, and previous node.
+    """
+    adj = graph.adj
+    for source_id in adj:
+        distances = {source_id: 0}
+        queue = deque([source_id])
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[current] + 1
+            for neighbor in adj[current]:
+                if neighbor not in distances:
+                    distances[neighbor] = next_distance
+                    queue.append(neighbor)
+                    yield {
+                        'source': source_id,
+                        'destination': neighbor,
+                        'distance': next_distance,
+                        'previous': current
+                    }
+
+
+def calculate_hop_matrices(network: IoTNetwork) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate all-pairs hop counts, BFS predecessors and discovery order as dense matrices.
+    
+    Rows and columns follow network.node_ids. Uses the parallel Numba kernel when Numba
+    is installed, one source per thread; otherwise runs one BFS per source in Python.
+    Needs 12 * N^2 bytes, so it suits networks of up to a few thousand nodes.
+    
+    Returns:
+        Tuple of (hops, previous, order) int32 arrays of shape (N, N). hops[s, d] is the
+        hop count from s to d and previous[s, d] the position of the node before d on
+        that path; both are -1 when d is unreachable, and previous[s, s] is -1. order[s]
+        lists the positions reached from s in BFS discovery order, s first, padded
+        with -1.
+    """
+    indptr, indices = network.csr_adjacency
+    if NUMBA_AVAILABLE:
+        return all_pairs_bfs(indptr, indices)
+    
+    n_nodes = len(indptr) - 1
+    hops = np.full((n_nodes, n_nodes), -1, dtype=np.int32)
+    previous = np.full((n_nodes, n_nodes), -1, dtype=np.int32)
+    order = np.full((n_nodes, n_nodes), -1, dtype=np.int32)
+    neighbor_lists = [indices[indptr[i]:indptr[i + 1]].tolist() for i in range(n_nodes)]
+    for source in range(n_nodes):
+        source_hops = {source: 0}
+        source_previous = {}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            next_hops = source_hops[current] + 1
+            for neighbor in neighbor_lists[current]:
+                if neighbor not in source_hops:
+                    source_hops[neighbor] = next_hops
+                    source_previous[neighbor] = current
+                    queue.append(neighbor)
+        hops[source, list(source_hops)] = list(source_hops.values())
+        previous[source, list(source_previous)] = list(source_previous.values())
+        order[source, :len(source_hops)] = list(source_hops)
+    return hops, previous, order
+
+
+def iter_network_path_entries(network: IoTNetwork) -> Iterator[Dict]:
+    """Yield export entries for all pairs of a network, using the BFS kernel when it fits.
+    
+    With Numba installed and at most HOP_MATRIX_MAX_NODES nodes, all searches run at
+    once in the parallel kernel and the entries are read off its matrices; otherwise
+    this is iter_path_entries(network.graph). Either way the entries and their order
+    are the same.
+    
+    Yields:
+        Path entries with source, destination, distance, and previous node.
+    """
+    if not NUMBA_AVAILABLE or len(network) > HOP_MATRIX_MAX_NODES:
+        yield from iter_path_entries(network.graph)
+        return
+    
+    node_ids = network.node_ids
+    hops, previous, order = calculate_hop_matrices(network)
+    reached_counts = (hops >= 0).sum(axis=1).tolist()
+    for source, reached_count in enumerate(reached_counts):
+        source_id = node_ids[source]
+        destinations = order[source, 1:reached_count]
+        for destination, distance, previous_node in zip(destinations.tolist(),
+                                                        hops[source, destinations].tolist(),
+                                                        previous[source, destinations].tolist()):
+            yield {
+                'source': source_id,
+                'destination': node_ids[destination],
+                'distance': distance,
+                'previous': node_ids[previous_node]
+            }
+
+
+def calculate_path_entries(graph: nx.Graph) -> List[Dict]:
+    """Calculate export entries for all pairs as a list (see iter_path_entries)."""
+    return list(iter_path_entries(graph))
+
+
+def save_paths_to_file(path_data: Iterable[Dict], output_file: str, ndjson: bool = False) -> int:
+    """Save path data to a JSON file, or to newline-delimited JSON if ndjson is set.
+    
+    Entries are encoded and written one at a time, so path_data can be a generator
+    such as iter_path_entries() and the full table is never held in memory.
+    
+    Returns:
+        Number of entries written.
+    """
     try:
-        with open(output_file, 'w') as f:
-            json.dump(path_data, f, indent=2)
+        if ndjson:
+            return save_ndjson(path_data, output_file)
+        return save_json_array(path_data, output_file)
     except IOError as e:
         raise IOError(f"Failed to write to {output_file}: {e}")
 
 
 def load_network_from_file(network_file: str) -> IoTNetwork:
-    """Load network from file."""
+    """Load network from a JSON or NPZ file."""
     try:
         return IoTNetwork.load_from_file(network_file)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+    except (FileNotFoundError, json.JSONDecodeError, zipfile.BadZipFile) as e:
         raise IOError(f"Failed to load network from {network_file}: {e}")
 
 
 def main() -> None:
     """CLI entry point for pathfinding."""
     parser = argparse.ArgumentParser(description='Calculate shortest paths in IoT network')
-    parser.add_argument('input_file', help='Path to the network JSON file')
+    parser.add_argument('input_file', help='Path to the network file (.json, or .npz for the faster binary format)')
     parser.add_argument('-o', '--output', default='paths.json', help='Output file path (default: paths.json)')
+    parser.add_argument('--ndjson', action='store_true', help='Write one JSON object per line instead of an indented array')
     parser.add_argument('--log-level', default='INFO', help='Logging level (DEBUG, INFO, WARNING, ERROR)')
     
     args = parser.parse_args()
@@ -109,16 +340,11 @@ def main() -> None:
         logger.info("Loading network from %s", args.input_file)
         network = load_network_from_file(args.input_file)
         
-        logger.info("Calculating all-pairs shortest paths for %d nodes", len(network.graph.nodes))
-        all_paths = calculate_all_shortest_paths(network.graph)
-        
-        logger.info("Formatting path data for export")
-        path_data = format_paths_for_export(all_paths)
-        
-        logger.info("Saving %d paths to %s", len(path_data), args.output)
-        save_paths_to_file(path_data, args.output)
+        logger.info("Calculating all-pairs shortest paths for %d nodes and saving to %s",
+                    len(network.graph.nodes), args.output)
+        path_count = save_paths_to_file(iter_network_path_entries(network), args.output, ndjson=args.ndjson)
         
-        logger.info("Completed successfully: %d paths calculated and saved", len(path_data))
+        logger.info("Completed successfully: %d paths calculated and saved", path_count)
         
     except (ValueError, IOError) as e:
         logger.error("Failed to process paths: %s", e)
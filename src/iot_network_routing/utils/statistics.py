@@ -3,6 +3,7 @@ Network statistics calculation utilities.
 """
 
 from typing import Dict, List, Any
+import numpy as np
 from ..core.network import IoTNetwork
 
 
@@ -14,17 +15,16 @@ class NetworkStatistics:
     
     def basic_stats(self) -> Dict[str, Any]:
         """Calculate basic network statistics."""
-        if not self.network.nodes:
+        total_nodes = len(self.network)
+        if total_nodes == 0:
             return {"error": "No nodes in network"}
-        
-        total_nodes = len(self.network.nodes)
         total_connections = self.network.get_connection_count()
         
-        connection_counts = [len(node.neighbors) for node in self.network.nodes]
-        avg_connections = sum(connection_counts) / len(connection_counts) if connection_counts else 0
-        max_connections = max(connection_counts) if connection_counts else 0
-        min_connections = min(connection_counts) if connection_counts else 0
-        isolated_nodes = sum(1 for count in connection_counts if count == 0)
+        connection_counts = self.network.degrees
+        avg_connections = float(connection_counts.mean())
+        max_connections = int(connection_counts.max())
+        min_connections = int(connection_counts.min())
+        isolated_nodes = int(np.count_nonzero(connection_counts == 0))
         
         return {
             "total_nodes": total_nodes,
@@ -37,38 +37,35 @@ class NetworkStatistics:
         }
     
     def connectivity_distribution(self) -> Dict[int, int]:
-        """Get distribution of connectivity levels."""
-        distribution = {}
-        for node in self.network.nodes:
-            count = len(node.neighbors)
-            distribution[count] = distribution.get(count, 0) + 1
-        return distribution
+        """Get distribution of connectivity levels, keyed by number of connections in ascending order."""
+        counts = np.bincount(self.network.degrees)
+        levels = np.flatnonzero(counts)
+        return dict(zip(levels.tolist(), counts[levels].tolist()))
     
     def range_statistics(self) -> Dict[str, float]:
         """Calculate communication range statistics."""
-        ranges = [node.communication_range for node in self.network.nodes]
-        if not ranges:
+        ranges = self.network.ranges
+        if len(ranges) == 0:
             return {}
         
         return {
-            "avg_range": round(sum(ranges) / len(ranges), 2),
-            "max_range": round(max(ranges), 2),
-            "min_range": round(min(ranges), 2)
+            "avg_range": round(float(ranges.mean()), 2),
+            "max_range": round(float(ranges.max()), 2),
+            "min_range": round(float(ranges.min()), 2)
         }
     
     def position_bounds(self) -> Dict[str, float]:
         """Get network position boundaries."""
-        if not self.network.nodes:
+        if len(self.network) == 0:
             return {}
         
-        x_coords = [node.x for node in self.network.nodes]
-        y_coords = [node.y for node in self.network.nodes]
+        x_coords, y_coords = self.network.xs, self.network.ys
         
         return {
-            "x_min": min(x_coords),
-            "x_max": max(x_coords),
-            "y_min": min(y_coords),
-            "y_max": max(y_coords)
+            "x_min": float(x_coords.min()),
+            "x_max": float(x_coords.max()),
+            "y_min": float(y_coords.min()),
+            "y_max": float(y_coords.max())
         }
     
     def full_report(self) -> Dict[str, Any]:
@@ -3,16 +3,33 @@ Flask web application for IoT network visualization.
 Provides interactive web interface for network analysis and visualization.
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context
+import hashlib
+import io
 import json
 import os
 import math
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+import numpy as np
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 from ..core.network import IoTNetwork
 from ..core.node import IoTNode
 from ..core.generator import generate_random_network
+from ..core.serialization import dumps
 from ..utils.pathfinder import find_shortest_path, load_network_from_file
+from ..utils.statistics import NetworkStatistics
+
+# Links per line of the streamed /api/network_data/stream response
+LINK_BATCH_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class NetworkState:
+    """Immutable snapshot of the loaded network and its pre-serialized D3 payload."""
+    network: Optional[IoTNetwork] = None
+    data_json: bytes = b""
+    data_etag: str = ""
 
 
 def create_app(config: Optional[Dict] = None) -> Flask:
@@ -24,39 +41,34 @@ def create_app(config: Optional[Dict] = None) -> Flask:
     if config:
         app.config.update(config)
     
-    # Global variable to store current network
-    current_network: IoTNetwork = None
-    network_data: Dict[str, Any] = {}
+    # Current network snapshot. Writers build a complete new NetworkState and swap the
+    # reference; readers grab it once per request, so they never see a half-updated state.
+    state = NetworkState()
+    # (network, version, stats) of the last stats computation, swapped as one tuple
+    stats_cache: Tuple[Optional[IoTNetwork], int, Optional[Dict[str, Any]]] = (None, -1, None)
+    # ((path, mtime_ns, size), network) of the last sample file parsed, swapped as one tuple
+    sample_cache: Tuple[Optional[Tuple[str, int, int]], Optional[IoTNetwork]] = (None, None)
 
     def calculate_network_stats(network: IoTNetwork) -> Dict[str, Any]:
         """Calculate comprehensive network statistics."""
-        if not network.nodes:
-            return {"error": "No nodes in network"}
-        
         # Basic statistics
-        total_nodes = len(network.nodes)
+        total_nodes = len(network)
+        if total_nodes == 0:
+            return {"error": "No nodes in network"}
         total_connections = network.get_connection_count()
         
-        # Connection statistics
-        connection_counts = [len(node.neighbors) for node in network.nodes]
-        avg_connections = sum(connection_counts) / len(connection_counts) if connection_counts else 0
-        max_connections = max(connection_counts) if connection_counts else 0
-        min_connections = min(connection_counts) if connection_counts else 0
-        isolated_nodes = sum(1 for count in connection_counts if count == 0)
-        
-        # Position statistics
-        x_coords = [node.x for node in network.nodes]
-        y_coords = [node.y for node in network.nodes]
-        
-        # Communication range statistics
-        ranges = [node.communication_range for node in network.nodes]
-        avg_range = sum(ranges) / len(ranges) if ranges else 0
-        max_range = max(ranges) if ranges else 0
+        # Connection statistics and connectivity distribution from the cached degree array
+        degrees = network.degrees
+        avg_connections = float(degrees.mean())
+        max_connections = int(degrees.max())
+        min_connections = int(degrees.min())
+        isolated_nodes = int(np.count_nonzero(degrees == 0))
+        connectivity_dist = NetworkStatistics(network).connectivity_distribution()
         
-        # Connectivity distribution
-        connectivity_dist = {}
-        for count in connection_counts:
-            connectivity_dist[count] = connectivity_dist.get(count, 0) + 1
+        # Position and range statistics from the network's cached coordinate arrays
+        xs, ys, ranges = network.xs, network.ys, network.ranges
+        avg_range = float(ranges.mean())
+        max_range = float(ranges.max())
         
         return {
             "total_nodes": total_nodes,
@@ -67,8 +79,8 @@ def create_app(config: Optional[Dict] = None) -> Flask:
             "isolated_nodes": isolated_nodes,
             "network_density": round(total_connections / (total_nodes * (total_nodes - 1) / 2), 4) if total_nodes > 1 else 0,
             "position_bounds": {
-                "x_min": min(x_coords), "x_max": max(x_coords),
-                "y_min": min(y_coords), "y_max": max(y_coords)
+                "x_min": float(xs.min()), "x_max": float(xs.max()),
+                "y_min": float(ys.min()), "y_max": float(ys.max())
             },
             "range_stats": {
                 "avg_range": round(avg_range, 2),
@@ -79,47 +91,93 @@ def create_app(config: Optional[Dict] = None) -> Flask:
 
     def prepare_network_data_for_d3(network: IoTNetwork) -> Dict[str, Any]:
         """Prepare network data in D3.js format."""
-        if not network.nodes:
+        if len(network) == 0:
             return {"nodes": [], "links": []}
         
-        # Prepare nodes
-        nodes = []
-        node_id_map = {node.eui64: i for i, node in enumerate(network.nodes)}
+        return {"nodes": prepare_d3_nodes(network),
+                "links": [link for batch in iter_d3_link_batches(network) for link in batch]}
+
+    def prepare_d3_nodes(network: IoTNetwork) -> List[Dict[str, Any]]:
+        """Prepare the D3.js node list."""
+        node_attrs = network.graph.nodes
+        degrees = network.degrees
+        groups = np.minimum(degrees, 8)  # Group by connectivity (max 8)
         
-        for i, node in enumerate(network.nodes):
+        # Coordinates come from the attribute dicts rather than the float arrays so
+        # values loaded as integers are sent unchanged
+        nodes = []
+        for i, (node_id, degree, group) in enumerate(zip(network.node_ids, degrees.tolist(), groups.tolist())):
+            attrs = node_attrs[node_id]
             nodes.append({
                 "id": i,
-                "eui64": node.eui64,
-                "x": node.x,
-                "y": node.y,
-                "range": node.communication_range,
-                "neighbors": len(node.neighbors),
-                "group": min(len(node.neighbors), 8)  # Group by connectivity (max 8)
+                "eui64": node_id,
+                "x": attrs['x'],
+                "y": attrs['y'],
+                "range": attrs['communication_range'],
+                "neighbors": degree,
+                "group": group
             })
+        return nodes
+
+    def iter_d3_link_batches(network: IoTNetwork, batch_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the D3.js link list in batches of at most batch_size links.
         
-        # Prepare links
-        links = []
-        added_links = set()
+        Link geometry is computed up front as arrays; the per-link dicts are only
+        built one batch at a time. With batch_size None all links come in one batch.
+        """
+        # The network's cached edge index lists each undirected edge once, from
+        # its lower-indexed end, in adjacency order
+        sources, targets = network.edge_index.T
         
-        for node in network.nodes:
-            source_id = node_id_map[node.eui64]
-            for neighbor in node.neighbors:
-                target_id = node_id_map[neighbor.eui64]
-                
-                # Avoid duplicate links
-                link_key = tuple(sorted([source_id, target_id]))
-                if link_key not in added_links:
-                    distance = node.distance_to(neighbor)
-                    links.append({
-                        "source": source_id,
-                        "target": target_id,
-                        "distance": round(distance, 2),
-                        "strength": max(0.1, 1 - distance / 200)  # Link strength based on distance
-                    })
-                    added_links.add(link_key)
+        xs, ys = network.xs, network.ys
+        dx = xs[sources] - xs[targets]
+        dy = ys[sources] - ys[targets]
+        distances = np.sqrt(dx * dx + dy * dy)
+        strengths = np.maximum(0.1, 1 - distances / 200)  # Link strength based on distance
         
-        return {"nodes": nodes, "links": links}
+        step = batch_size or max(len(sources), 1)
+        for start in range(0, len(sources), step):
+            batch = slice(start, start + step)
+            yield [
+                {"source": source, "target": target, "distance": round(distance, 2), "strength": strength}
+                for source, target, distance, strength in zip(sources[batch].tolist(), targets[batch].tolist(),
+                                                              distances[batch].tolist(), strengths[batch].tolist())
+            ]
+
+    def get_cached_network_stats(network: IoTNetwork) -> Dict[str, Any]:
+        """Return network statistics, recomputing only after the network changes."""
+        nonlocal stats_cache
+        # Holding the network itself (not its id) means a new network can never alias the entry
+        cached_network, cached_version, stats = stats_cache
+        version = network.version
+        if cached_network is not network or cached_version != version:
+            stats = calculate_network_stats(network)
+            stats_cache = (network, version, stats)
+        return stats
 
+    def json_response(data: Any) -> Response:
+        """Serialize an API payload with the shared encoder (orjson when installed)."""
+        return Response(dumps(data, pretty=False), mimetype='application/json')
+
+    def load_sample_network(sample_file: str) -> IoTNetwork:
+        """Parse a sample network file, reusing the last result while the file is unchanged."""
+        nonlocal sample_cache
+        stat = os.stat(sample_file)
+        key = (sample_file, stat.st_mtime_ns, stat.st_size)
+        cached_key, network = sample_cache
+        if cached_key != key:
+            network = IoTNetwork.load_from_file(sample_file)
+            sample_cache = (key, network)
+        return network
+
+    def publish_network(network: IoTNetwork) -> None:
+        """Make a newly loaded network current, serializing its D3 payload once up front."""
+        nonlocal state
+        data_json = dumps(prepare_network_data_for_d3(network), pretty=False)
+        state = NetworkState(network=network,
+                             data_json=data_json,
+                             data_etag=hashlib.sha1(data_json).hexdigest())
 
     @app.route('/')
     def index():
@@ -129,8 +187,6 @@ def create_app(config: Optional[Dict] = None) -> Flask:
     @app.route('/upload', methods=['POST'])
     def upload_network():
         """Upload and load network file."""
-        nonlocal current_network, network_data
-        
         if 'file' not in request.files:
             return jsonify({"error": "No file provided"}), 400
         
@@ -140,27 +196,20 @@ def create_app(config: Optional[Dict] = None) -> Flask:
         
         if file and file.filename.endswith('.json'):
             try:
-                # Save uploaded file temporarily
-                temp_path = f"/tmp/{file.filename}"
-                file.save(temp_path)
-                
-                # Load network
-                current_network = IoTNetwork.load_from_file(temp_path)
+                # Parse the upload straight from its in-memory stream
+                current_network = IoTNetwork.load_from_stream(file.stream)
                 
                 # NetworkX undirected graphs are inherently bidirectional
                 validation_msg = "All connections are bidirectional"
                 
-                network_data = prepare_network_data_for_d3(current_network)
-                
-                # Clean up temp file
-                os.remove(temp_path)
+                publish_network(current_network)
                 
                 message = f"Network loaded successfully: {len(current_network)} nodes. {validation_msg}"
                 
                 return jsonify({
                     "success": True,
                     "message": message,
-                    "stats": calculate_network_stats(current_network)
+                    "stats": get_cached_network_stats(current_network)
                 })
                 
             except Exception as e:
@@ -171,8 +220,6 @@ def create_app(config: Optional[Dict] = None) -> Flask:
     @app.route('/load_sample')
     def load_sample():
         """Load sample network for demonstration."""
-        nonlocal current_network, network_data
-        
         try:
             # Check if sample network exists
             sample_files = ['dense_network.json', 'test_network.json', 'iot_network.json']
@@ -186,20 +233,22 @@ def create_app(config: Optional[Dict] = None) -> Flask:
             if not sample_file:
                 return jsonify({"error": "No sample network found. Please generate one first."}), 404
             
-            # Load sample network
-            current_network = IoTNetwork.load_from_file(sample_file)
+            # Load sample network; an unchanged file reuses the network parsed last time
+            current_network = load_sample_network(sample_file)
             
             # NetworkX undirected graphs are inherently bidirectional
             validation_msg = "All connections are bidirectional"
             
-            network_data = prepare_network_data_for_d3(current_network)
+            # Reloading the sample that is already shown keeps its serialized payload
+            if state.network is not current_network:
+                publish_network(current_network)
             
             message = f"Sample network loaded: {len(current_network)} nodes. {validation_msg}"
             
             return jsonify({
                 "success": True,
                 "message": message,
-                "stats": calculate_network_stats(current_network)
+                "stats": get_cached_network_stats(current_network)
             })
             
         except Exception as e:
@@ -208,52 +257,76 @@ def create_app(config: Optional[Dict] = None) -> Flask:
     @app.route('/api/network_data')
     def get_network_data():
         """Get current network data for visualization."""
-        nonlocal network_data
+        snapshot = state
+        if not snapshot.data_json:
+            return jsonify({"error": "No network loaded"}), 404
         
-        if not network_data:
+        # Serve the pre-serialized payload; clients holding the same ETag get a 304
+        response = Response(snapshot.data_json, mimetype='application/json')
+        response.set_etag(snapshot.data_etag)
+        return response.make_conditional(request)
+
+    @app.route('/api/network_data/stream')
+    def stream_network_data():
+        """
+        Stream current network data as newline-delimited JSON.
+        
+        The first line is {"type": "nodes", "data": [...]}, followed by
+        {"type": "links", "data": [...]} lines of up to LINK_BATCH_SIZE links,
+        so clients can start on the nodes before all links have been encoded.
+        """
+        current_network = state.network
+        if not current_network:
             return jsonify({"error": "No network loaded"}), 404
         
-        return jsonify(network_data)
+        def generate() -> Iterator[bytes]:
+            yield dumps({"type": "nodes", "data": prepare_d3_nodes(current_network)}, pretty=False) + b"\n"
+            for batch in iter_d3_link_batches(current_network, LINK_BATCH_SIZE):
+                yield dumps({"type": "links", "data": batch}, pretty=False) + b"\n"
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
     @app.route('/api/network_stats')
     def get_network_stats():
         """Get comprehensive network statistics."""
-        nonlocal current_network
+        current_network = state.network
         
         if not current_network:
             return jsonify({"error": "No network loaded"}), 404
         
-        return jsonify(calculate_network_stats(current_network))
+        return json_response(get_cached_network_stats(current_network))
 
     @app.route('/api/node_details/<node_id>')
     def get_node_details(node_id):
         """Get detailed information about a specific node."""
-        nonlocal current_network
+        current_network = state.network
         
         if not current_network:
             return jsonify({"error": "No network loaded"}), 404
         
         try:
             node_index = int(node_id)
-            if 0 <= node_index < len(current_network.nodes):
-                node = current_network.nodes[node_index]
+            if 0 <= node_index < len(current_network):
+                graph = current_network.graph
+                eui64 = current_network.node_ids[node_index]
+                node = graph.nodes[eui64]
                 
-                # Get neighbor details
+                # Get neighbor details straight from the adjacency; edge weights hold the distances
                 neighbor_details = []
-                for neighbor in node.neighbors:
-                    distance = node.distance_to(neighbor)
+                for neighbor_eui64, edge in graph.adj[eui64].items():
+                    neighbor = graph.nodes[neighbor_eui64]
                     neighbor_details.append({
-                        "eui64": neighbor.eui64,
-                        "position": {"x": neighbor.x, "y": neighbor.y},
-                        "distance": round(distance, 2),
-                        "range": neighbor.communication_range
+                        "eui64": neighbor_eui64,
+                        "position": {"x": neighbor['x'], "y": neighbor['y']},
+                        "distance": round(edge['weight'], 2),
+                        "range": neighbor['communication_range']
                     })
                 
-                return jsonify({
-                    "eui64": node.eui64,
-                    "position": {"x": node.x, "y": node.y},
-                    "range": node.communication_range,
-                    "neighbor_count": len(node.neighbors),
+                return json_response({
+                    "eui64": eui64,
+                    "position": {"x": node['x'], "y": node['y']},
+                    "range": node['communication_range'],
+                    "neighbor_count": len(neighbor_details),
                     "neighbors": neighbor_details
                 })
             else:
@@ -265,8 +338,6 @@ def create_app(config: Optional[Dict] = None) -> Flask:
     @app.route('/api/generate_network', methods=['POST'])
     def generate_network_api():
         """Generate a new random network."""
-        nonlocal current_network, network_data
-        
         try:
             data = request.get_json()
             n_nodes = data.get('nodes', 25)
@@ -284,14 +355,14 @@ def create_app(config: Optional[Dict] = None) -> Flask:
             # NetworkX undirected graphs are inherently bidirectional
             validation_msg = "All connections are bidirectional"
             
-            network_data = prepare_network_data_for_d3(current_network)
+            publish_network(current_network)
             
             message = f"Generated network with {len(current_network)} nodes. {validation_msg}"
             
             return jsonify({
                 "success": True,
                 "message": message,
-                "stats": calculate_network_stats(current_network)
+                "stats": get_cached_network_stats(current_network)
             })
             
         except Exception as e:
@@ -300,16 +371,16 @@ def create_app(config: Optional[Dict] = None) -> Flask:
     @app.route('/api/export_network')
     def export_network():
         """Export current network to JSON file."""
-        nonlocal current_network
+        current_network = state.network
         
         if not current_network:
             return jsonify({"error": "No network loaded"}), 404
         
         try:
-            export_path = "/tmp/exported_network.json"
-            current_network.save_to_file(export_path)
+            # Encode in memory; same bytes as save_to_file without a shared temp file
+            export_data = io.BytesIO(dumps(current_network.to_dict()))
             
-            return send_file(export_path, 
+            return send_file(export_data, 
                             as_attachment=True,
                             download_name='iot_network.json',
                             mimetype='application/json')
@@ -320,7 +391,7 @@ def create_app(config: Optional[Dict] = None) -> Flask:
     @app.route('/api/find_path', methods=['POST'])
     def find_path():
         """Find shortest path between two nodes."""
-        nonlocal current_network
+        current_network = state.network
         
         if not current_network:
             return jsonify({"error": "No network loaded"}), 404
@@ -334,7 +405,7 @@ def create_app(config: Optional[Dict] = None) -> Flask:
                 return jsonify({"error": "Source and destination node IDs are required"}), 400
             
             # Verify nodes exist in network
-            node_ids = [node.eui64 for node in current_network.nodes]
+            node_ids = current_network.graph.nodes
             if source_id not in node_ids:
                 return jsonify({"error": f"Source node {source_id} not found"}), 404
             if destination_id not in node_ids:
@@ -347,20 +418,21 @@ def create_app(config: Optional[Dict] = None) -> Flask:
             path, distance = find_shortest_path(current_network.graph, source_id, destination_id)
             
             if path is None:
-                return jsonify({
+                return json_response({
                     "source": source_id,
                     "destination": destination_id,
                     "path": None,
-                    "distance": float('inf'),
+                    # Infinity is not valid JSON; unreachable pairs report no distance
+                    "distance": None,
                     "reachable": False,
                     "message": "No path found between nodes"
                 })
             
             # Convert path to include node indices for visualization
-            node_id_to_index = {node.eui64: i for i, node in enumerate(current_network.nodes)}
+            node_id_to_index = current_network.node_index
             path_indices = [node_id_to_index[node_id] for node_id in path]
             
-            return jsonify({
+            return json_response({
                 "source": source_id,
                 "destination": destination_id,
                 "path": path,
@@ -2,38 +2,67 @@
 Web application entry point for IoT Network Routing.
 """
 
+import argparse
 import sys
+from typing import Optional
+
 from .app import create_app
+from ..core.kernels import warm_up
 from ..utils.logging_config import setup_logging, get_logger
 
 logger = get_logger(__name__)
 
+# Worker threads used by the waitress server in --prod mode
+PROD_THREADS = 8
+
 
-def main():
-    """Main entry point for the web application."""
+def main(argv: Optional[list] = None) -> None:
+    """
+    Main entry point for the web application.
+    
+    Args:
+        argv: List of command-line arguments
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    parser = argparse.ArgumentParser(description='IoT Network Routing web interface')
+    parser.add_argument('--port', type=int, default=5000,
+                       help='Port to listen on (default: 5000)')
+    parser.add_argument('--debug', action='store_true',
+                       help='Run the Flask development server in debug mode')
+    parser.add_argument('--prod', action='store_true',
+                       help='Serve through waitress with worker threads (ignored with --debug)')
+    
+    args = parser.parse_args(argv)
+    
     # Setup logging
     setup_logging(level='INFO')
     
     app = create_app()
+    # Compile optional Numba kernels now rather than on the first network request
+    warm_up()
     
-    # Check if we're in debug mode
-    debug = "--debug" in sys.argv
-    port = 5000
-    
-    # Parse port if provided
-    for i, arg in enumerate(sys.argv):
-        if arg == "--port" and i + 1 < len(sys.argv):
-            try:
-                port = int(sys.argv[i + 1])
-            except ValueError:
-                logger.error("Invalid port: %s", sys.argv[i + 1])
-                sys.exit(1)
+    debug = args.debug
+    prod = args.prod and not debug
+    port = args.port
     
     logger.info("🚀 Starting IoT Network Routing Web Interface")
     logger.info("   Server: http://localhost:%d", port)
     logger.info("   Debug mode: %s", debug)
     
-    app.run(debug=debug, host='0.0.0.0', port=port)
+    if prod:
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.warning("waitress not available. Falling back to the Flask development server")
+        else:
+            # Worker threads let slow requests (large payloads, path queries) overlap
+            logger.info("   Server: waitress (%d threads)", PROD_THREADS)
+            serve(app, host='0.0.0.0', port=port, threads=PROD_THREADS)
+            return
+    
+    app.run(debug=debug, host='0.0.0.0', port=port, threaded=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,18 @@
+"""
+WSGI entry point for serving the web interface with a production server.
+
+The loaded network lives in process memory, so run a single worker process
+and scale with threads; separate workers would each hold their own network:
+
+    gunicorn --workers 1 --threads 8 iot_network_routing.web.wsgi:application
+"""
+
+from .app import create_app
+from ..core.kernels import warm_up
+from ..utils.logging_config import setup_logging
+
+setup_logging(level='INFO')
+
+application = create_app()
+# Compile optional Numba kernels at worker boot rather than on the first request
+warm_up()
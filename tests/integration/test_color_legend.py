@@ -8,6 +8,7 @@ from src.iot_network_routing.core.generator import generate_random_network
 from src.iot_network_routing.core.node import IoTNode
 from src.iot_network_routing.core.network import IoTNetwork
 import json
+import numpy as np
 
 def create_test_networks():
     """Create test networks with different connectivity patterns."""
@@ -24,8 +25,7 @@ def create_test_networks():
         max_range=60  # Low range for sparse connections
     )
     
-    connections = [len(node.neighbors) for node in sparse_network.nodes]
-    print(f"   Connection distribution: {analyze_connections(connections)}")
+    print(f"   Connection distribution: {analyze_connections(sparse_network.degrees)}")
     
     # Test 2: Medium density network (mix of connectivity levels)
     print("\n2. Testing Medium Density Network (0-5 connections)...")
@@ -36,8 +36,7 @@ def create_test_networks():
         max_range=120  # Medium range
     )
     
-    connections = [len(node.neighbors) for node in medium_network.nodes]
-    print(f"   Connection distribution: {analyze_connections(connections)}")
+    print(f"   Connection distribution: {analyze_connections(medium_network.degrees)}")
     
     # Test 3: Dense network (high connectivity - purple/pink/brown)
     print("\n3. Testing Dense Network (high connectivity)...")
@@ -48,8 +47,7 @@ def create_test_networks():
         max_range=180  # High range for dense connections
     )
     
-    connections = [len(node.neighbors) for node in dense_network.nodes]
-    print(f"   Connection distribution: {analyze_connections(connections)}")
+    print(f"   Connection distribution: {analyze_connections(dense_network.degrees)}")
     
     # Test 4: Very dense network (maximum connectivity)
     print("\n4. Testing Very Dense Network (8+ connections)...")
@@ -60,38 +58,31 @@ def create_test_networks():
         max_range=200  # Very high range
     )
     
-    connections = [len(node.neighbors) for node in very_dense_network.nodes]
-    print(f"   Connection distribution: {analyze_connections(connections)}")
+    print(f"   Connection distribution: {analyze_connections(very_dense_network.degrees)}")
     
     return sparse_network, medium_network, dense_network, very_dense_network
 
 def analyze_connections(connections):
-    """Analyze connection distribution and map to color scheme."""
-    
-    color_scheme = {
-        0: "🔴 Red (Isolated)",
-        1: "🟠 Orange (Very Low)", 
-        2: "🟡 Yellow (Low)",
-        3: "🟢 Green (Medium)",
-        4: "🔵 Blue (Good)",
-        5: "🟣 Purple (High)",
-        6: "🩷 Pink (Very High)",
-        7: "🤎 Brown (Extremely High)",
-        8: "🔘 Blue Grey (Maximum)"
-    }
-    
-    distribution = {}
-    for conn in connections:
-        level = min(conn, 8)  # Cap at 8 for the color scheme
-        if level not in distribution:
-            distribution[level] = 0
-        distribution[level] += 1
+    """Analyze connection distribution (an array of per-node connection counts) and map to color scheme."""
+    
+    color_scheme = (
+        "🔴 Red (Isolated)",
+        "🟠 Orange (Very Low)", 
+        "🟡 Yellow (Low)",
+        "🟢 Green (Medium)",
+        "🔵 Blue (Good)",
+        "🟣 Purple (High)",
+        "🩷 Pink (Very High)",
+        "🤎 Brown (Extremely High)",
+        "🔘 Blue Grey (Maximum)"
+    )
+    
+    # Cap at 8 for the color scheme, then count every level in one pass
+    distribution = np.bincount(np.minimum(connections, 8))
     
     result = []
-    for level in sorted(distribution.keys()):
-        count = distribution[level]
-        color_name = color_scheme.get(level, f"🔘 Level {level}")
-        result.append(f"{color_name}: {count} nodes")
+    for level in np.flatnonzero(distribution).tolist():
+        result.append(f"{color_scheme[level]}: {distribution[level]} nodes")
     
     return " | ".join(result)
 
@@ -148,8 +139,8 @@ def save_test_networks(networks):
     for i, (network, name) in enumerate(zip(networks, network_names)):
         filename = f"test_network_{name}.json"
         network.save_to_file(filename)
-        connections = [len(node.neighbors) for node in network.nodes]
-        print(f"✅ Saved {filename}: {len(network)} nodes, max connections: {max(connections) if connections else 0}")
+        max_connections = int(network.degrees.max()) if len(network) else 0
+        print(f"✅ Saved {filename}: {len(network)} nodes, max connections: {max_connections}")
 
 def main():
     """Run all color legend tests."""
@@ -4,6 +4,9 @@ Test script to verify the refactored IoT network generation.
 Tests that nodes can connect using only max_range parameter.
 """
 
+import networkx as nx
+import numpy as np
+
 from src.iot_network_routing.core.generator import generate_random_network
 from src.iot_network_routing.core.node import IoTNode
 from src.iot_network_routing.core.network import IoTNetwork
@@ -23,27 +26,22 @@ def test_basic_functionality():
     print(f"✓ Generated network with {len(network)} nodes")
     print(f"✓ Total connections: {network.get_connection_count()}")
     
-    # Test that connections use max_range logic
-    connected_pairs = 0
-    total_pairs = 0
-    
-    for i, node1 in enumerate(network.nodes):
-        for j, node2 in enumerate(network.nodes[i+1:], i+1):
-            total_pairs += 1
-            distance = node1.distance_to(node2)
-            max_range = max(node1.communication_range, node2.communication_range)
-            
-            # Check if they should be connected
-            should_be_connected = distance <= max_range
-            are_connected = node2 in node1.neighbors
-            
-            if should_be_connected == are_connected:
-                connected_pairs += 1
-            else:
-                print(f"✗ Connection mismatch: {node1.eui64[:8]} - {node2.eui64[:8]}")
-                print(f"  Distance: {distance:.2f}, Max range: {max_range:.2f}")
-                print(f"  Should be connected: {should_be_connected}, Are connected: {are_connected}")
-    
+    # Test that connections use max_range logic, checking every pair at once
+    xs, ys, ranges = network.xs, network.ys, network.ranges
+    distances = np.sqrt((xs[:, None] - xs[None, :]) ** 2 + (ys[:, None] - ys[None, :]) ** 2)
+    max_ranges = np.maximum.outer(ranges, ranges)
+    should_be_connected = distances <= max_ranges
+    are_connected = nx.to_numpy_array(network.graph, nodelist=network.node_ids) > 0
+    
+    upper_i, upper_j = np.triu_indices(len(network), k=1)
+    mismatches = np.flatnonzero(should_be_connected[upper_i, upper_j] != are_connected[upper_i, upper_j])
+    for i, j in zip(upper_i[mismatches].tolist(), upper_j[mismatches].tolist()):
+        print(f"✗ Connection mismatch: {network.node_ids[i][:8]} - {network.node_ids[j][:8]}")
+        print(f"  Distance: {distances[i, j]:.2f}, Max range: {max_ranges[i, j]:.2f}")
+        print(f"  Should be connected: {should_be_connected[i, j]}, Are connected: {are_connected[i, j]}")
+    
+    total_pairs = len(upper_i)
+    connected_pairs = total_pairs - len(mismatches)
     print(f"✓ Connection logic verified for {connected_pairs}/{total_pairs} node pairs")
     return connected_pairs == total_pairs
 
@@ -56,22 +54,22 @@ def test_range_variety():
         max_range=150
     )
     
-    ranges = [node.communication_range for node in network.nodes]
-    min_range = min(ranges)
-    max_range = max(ranges)
-    avg_range = sum(ranges) / len(ranges)
+    ranges = network.ranges
+    min_range = ranges.min()
+    max_range = ranges.max()
+    avg_range = ranges.mean()
     
     print(f"✓ Range statistics: min={min_range:.1f}, max={max_range:.1f}, avg={avg_range:.1f}")
     
     # Check that we have variety (not all nodes have the same range)
-    unique_ranges = len(set(ranges))
+    unique_ranges = np.unique(ranges).size
     print(f"✓ Unique range values: {unique_ranges}")
     
     # Check that ranges are within expected bounds (30% to 100% of max_range)
     expected_min = 150 * 0.3
     expected_max = 150
     
-    within_bounds = all(expected_min <= r <= expected_max for r in ranges)
+    within_bounds = bool(np.all((ranges >= expected_min) & (ranges <= expected_max)))
     print(f"✓ All ranges within bounds [{expected_min:.1f}, {expected_max:.1f}]: {within_bounds}")
     
     return unique_ranges > 1 and within_bounds
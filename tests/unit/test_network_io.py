@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for saving and loading networks.
+Checks that JSON and NPZ files round-trip nodes and connections.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.iot_network_routing.core.generator import generate_random_network
+from src.iot_network_routing.core.network import IoTNetwork
+
+
+def network_signature(network):
+    """Return node attributes and weighted connections in an order-independent form."""
+    nodes = {node_id: dict(attrs) for node_id, attrs in network.graph.nodes(data=True)}
+    edges = {frozenset((u, v)): weight for u, v, weight in network.graph.edges(data='weight')}
+    return nodes, edges
+
+
+def test_json_roundtrip(tmp_path):
+    """Test that a network saved as JSON loads back unchanged."""
+    network = generate_random_network(n_nodes=40, map_width=300, map_height=300, max_range=100, seed=11)
+    filename = str(tmp_path / "network.json")
+
+    network.save_to_file(filename)
+    loaded = IoTNetwork.load_from_file(filename)
+
+    print(f"✓ Loaded {len(loaded)} nodes, {loaded.get_connection_count()} connections")
+    assert network_signature(loaded) == network_signature(network)
+    assert loaded.to_dict() == network.to_dict()
+
+
+def test_npz_roundtrip(tmp_path):
+    """Test that a network saved as NPZ loads back unchanged."""
+    network = generate_random_network(n_nodes=40, map_width=300, map_height=300, max_range=100, seed=12)
+    filename = tmp_path / "network.npz"
+
+    network.save_to_file(filename)
+    loaded = IoTNetwork.load_from_file(filename)
+
+    print(f"✓ Loaded {len(loaded)} nodes, {loaded.get_connection_count()} connections")
+    assert loaded.node_ids == network.node_ids
+    assert network_signature(loaded) == network_signature(network)
+
+
+def test_async_save_captures_snapshot(tmp_path):
+    """Test that background saves write the network as it was when the save was issued."""
+    network = generate_random_network(n_nodes=40, map_width=300, map_height=300, max_range=100, seed=13)
+    expected = network_signature(network)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        futures = [network.save_to_file_async(tmp_path / name, executor) for name in ("n.json", "n.npz")]
+        network.remove_node(network.node_ids[0])
+        for future in futures:
+            future.result()
+
+    for name in ("n.json", "n.npz"):
+        assert network_signature(IoTNetwork.load_from_file(tmp_path / name)) == expected
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental network updates.
+Checks that single-node updates end in the same graph as a full rebuild.
+"""
+
+import numpy as np
+
+from src.iot_network_routing.core.generator import generate_random_network
+from src.iot_network_routing.core.network import IoTNetwork
+
+
+def edge_set(network):
+    """Return the network's connections as a set of frozensets."""
+    return {frozenset(edge) for edge in network.graph.edges()}
+
+
+def test_update_node_connections_matches_full_rebuild():
+    """Test that reconnecting a new node gives the same links as update_all_connections."""
+    network = generate_random_network(n_nodes=60, map_width=400, map_height=400, max_range=120, seed=7)
+
+    network.add_node("AA-BB-CC-DD-EE-FF-00-11", 200.0, 200.0, 90.0)
+    degree = network.update_node_connections("AA-BB-CC-DD-EE-FF-00-11")
+    incremental = edge_set(network)
+
+    network.update_all_connections()
+    print(f"✓ New node has {degree} connections")
+    assert incremental == edge_set(network)
+    assert degree == network.graph.degree("AA-BB-CC-DD-EE-FF-00-11")
+
+
+def test_update_node_connections_after_move():
+    """Test that moving a node and reconnecting it drops stale links."""
+    network = generate_random_network(n_nodes=40, map_width=300, map_height=300, max_range=100, seed=3)
+    node = network.nodes[0]
+
+    node.x, node.y = 10_000.0, 10_000.0
+    assert network.update_node_connections(node.eui64) == 0
+
+    network.update_all_connections()
+    assert network.graph.degree(node.eui64) == 0
+
+
+def test_add_node_with_connect():
+    """Test that inserting nodes one at a time with connect=True builds the full-rebuild graph."""
+    source = generate_random_network(n_nodes=50, map_width=300, map_height=300, max_range=90, seed=5)
+    network = IoTNetwork()
+    for node in source.nodes:
+        network.add_node(node.eui64, node.x, node.y, node.communication_range, connect=True)
+
+    assert edge_set(network) == edge_set(source)
+
+
+def test_update_connections_batch():
+    """Test that small and large batches of moves both match a full rebuild."""
+    for moved_count in (3, 30):
+        network = generate_random_network(n_nodes=60, map_width=400, map_height=400, max_range=120, seed=9)
+        moved = network.nodes[:moved_count]
+        for offset, node in enumerate(moved):
+            node.x, node.y = node.y, 10.0 * offset
+        network.update_connections(node.eui64 for node in moved)
+        batched = edge_set(network)
+
+        network.update_all_connections()
+        assert batched == edge_set(network)
+
+
+def test_non_plain_string_ids():
+    """Test that numpy string and integer node ids are accepted."""
+    network = IoTNetwork.from_arrays(np.array(["A", "B"]), [0.0, 5.0], [0.0, 0.0], [10.0, 10.0])
+    assert all(type(node_id) is str for node_id in network.node_ids)
+    assert network.graph.has_edge("A", "B")
+
+    network.add_node(7, 8.0, 0.0, 10.0, connect=True)
+    assert network.graph.has_edge(7, "B")
+    print(f"✓ Node ids: {list(network.node_ids)}")
+
+
+def test_direct_graph_edits_after_caching():
+    """Test that nodes removed, added or moved on network.graph directly are picked up."""
+    network = IoTNetwork()
+    network.add_node("A", 0.0, 0.0, 10.0)
+    network.add_node("B", 5.0, 0.0, 10.0)
+    network.update_all_connections()
+    assert len(network.xs) == 2
+
+    network.graph.remove_node("B")
+    network.update_all_connections()
+    assert network.node_ids == ("A",)
+    assert list(network.graph.edges()) == []
+
+    network.graph.add_node("C", x=3.0, y=0.0, communication_range=10.0)
+    assert network.xs.tolist() == [0.0, 3.0]
+    network.update_all_connections()
+    assert edge_set(network) == {frozenset(("A", "C"))}
+
+    network.graph.nodes["C"]["x"] = 50.0
+    network.update_all_connections()
+    assert edge_set(network) == set()
+    print("✓ Direct graph edits are reflected in derived arrays and connections")
+
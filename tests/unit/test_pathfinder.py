@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the pathfinding export helpers.
+Checks that the direct BFS export matches the NetworkX all-pairs paths.
+"""
+
+import networkx as nx
+
+from src.iot_network_routing.core.generator import generate_random_network
+from src.iot_network_routing.core.network import IoTNetwork
+from src.iot_network_routing.utils import pathfinder
+from src.iot_network_routing.utils.pathfinder import (
+    calculate_all_shortest_paths,
+    calculate_hop_matrices,
+    calculate_path_entries,
+    find_shortest_path,
+    format_paths_for_export,
+    iter_network_path_entries,
+)
+
+
+def test_path_entries_match_all_pairs_export():
+    """Test that calculate_path_entries gives the same entries as formatting all-pairs paths."""
+    network = generate_random_network(n_nodes=80, map_width=400, map_height=400, max_range=90, seed=4)
+
+    expected = format_paths_for_export(calculate_all_shortest_paths(network.graph))
+    entries = calculate_path_entries(network.graph)
+
+    print(f"✓ {len(entries)} path entries")
+    assert entries == expected
+
+
+def test_find_shortest_path_sees_topology_changes():
+    """Test that cached BFS results are dropped once the network changes."""
+    network = IoTNetwork()
+    network.add_node("A", 0.0, 0.0, 10.0)
+    network.add_node("B", 8.0, 0.0, 10.0)
+    node_c = network.add_node("C", 100.0, 0.0, 10.0)
+    network.update_all_connections()
+    for _ in range(2):
+        assert find_shortest_path(network.graph, "A", "C") == (None, float('inf'))
+        assert find_shortest_path(network.graph, "C", "A") == (None, float('inf'))
+
+    node_c.x = 16.0
+    network.update_node_connections("C")
+    for _ in range(2):
+        assert find_shortest_path(network.graph, "A", "C") == (["A", "B", "C"], 2)
+        assert find_shortest_path(network.graph, "C", "A") == (["C", "B", "A"], 2)
+    print("✓ Cached paths follow topology changes")
+
+
+def test_find_shortest_path_sees_direct_graph_edits():
+    """Test that edges added straight to network.graph invalidate cached BFS results."""
+    network = IoTNetwork()
+    network.add_node("A", 0.0, 0.0, 10.0)
+    network.add_node("B", 50.0, 0.0, 10.0)
+    network.update_all_connections()
+    assert find_shortest_path(network.graph, "A", "B") == (None, float('inf'))
+
+    network.graph.add_edge("A", "B", weight=50.0)
+    assert find_shortest_path(network.graph, "A", "B") == (["A", "B"], 1)
+    print("✓ Direct graph edits invalidate cached paths")
+
+
+def test_find_shortest_path_is_repeatable():
+    """Test that repeated queries return the same path when several shortest paths tie."""
+    network = generate_random_network(n_nodes=80, map_width=400, map_height=400, max_range=90, seed=4)
+    node_ids = network.node_ids
+
+    hops = nx.single_source_shortest_path_length(network.graph, node_ids[0])
+    first_answers = {}
+    for destination in node_ids[1:]:
+        first = find_shortest_path(network.graph, node_ids[0], destination)
+        assert first[1] == hops.get(destination, float('inf'))
+        assert find_shortest_path(network.graph, node_ids[0], destination) == first
+        first_answers[destination] = first
+    for destination, first in first_answers.items():
+        assert find_shortest_path(network.graph, node_ids[0], destination) == first
+    print(f"✓ Repeated queries from {node_ids[0]} are stable")
+
+
+def test_hop_matrices_match_path_entries():
+    """Test that the hop and predecessor matrices agree with the BFS export entries."""
+    network = generate_random_network(n_nodes=80, map_width=400, map_height=400, max_range=90, seed=4)
+    node_ids = network.node_ids
+    index = network.node_index
+
+    hops, previous, order = calculate_hop_matrices(network)
+    entries = calculate_path_entries(network.graph)
+
+    assert (hops >= 0).sum() == len(entries) + len(node_ids)
+    for entry in entries:
+        source, destination = index[entry['source']], index[entry['destination']]
+        assert hops[source, destination] == entry['distance']
+        assert node_ids[previous[source, destination]] == entry['previous']
+
+    discovered = [(entry['source'], entry['destination']) for entry in entries]
+    from_order = [(source_id, node_ids[destination])
+                  for source, source_id in enumerate(node_ids)
+                  for destination in order[source, 1:(hops[source] >= 0).sum()].tolist()]
+    assert from_order == discovered
+
+
+def test_network_path_entries_match_graph_export(monkeypatch):
+    """Test that the matrix-based export gives the same entries as the graph BFS, with and without Numba."""
+    network = generate_random_network(n_nodes=80, map_width=400, map_height=400, max_range=90, seed=4)
+    expected = calculate_path_entries(network.graph)
+
+    assert list(iter_network_path_entries(network)) == expected
+    kernel_matrices = calculate_hop_matrices(network)
+
+    monkeypatch.setattr(pathfinder, "NUMBA_AVAILABLE", False)
+    assert list(iter_network_path_entries(network)) == expected
+    for kernel, fallback in zip(kernel_matrices, calculate_hop_matrices(network)):
+        assert (kernel == fallback).all()
+    print(f"✓ {len(expected)} entries from the hop matrices")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON encoding helpers.
+Checks that the orjson and standard library paths accept the same values and agree.
+"""
+
+import numpy as np
+import pytest
+
+from src.iot_network_routing.core import serialization
+from src.iot_network_routing.core.network import IoTNetwork
+
+
+ENCODERS = [pytest.param(False, id="stdlib"),
+            pytest.param(True, id="orjson",
+                         marks=pytest.mark.skipif(not serialization.ORJSON_AVAILABLE,
+                                                  reason="orjson is not installed"))]
+
+
+@pytest.mark.parametrize("use_orjson", ENCODERS)
+def test_numpy_and_non_finite_values(monkeypatch, use_orjson):
+    """Test that NumPy scalars are encoded and inf/nan become null on either encoder."""
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", use_orjson)
+    data = {"x": np.float64(1.5), "n": np.int64(3), "r": np.float32(2.5),
+            "values": [float("inf"), np.float64("nan"), 4.0], "array": np.array([1.0, -np.inf])}
+
+    encoded = serialization.dumps(data, pretty=False)
+    print(f"✓ {encoded.decode()}")
+    assert serialization.loads(encoded) == {"x": 1.5, "n": 3, "r": 2.5,
+                                            "values": [None, None, 4.0], "array": [1.0, None]}
+
+
+@pytest.mark.parametrize("use_orjson", ENCODERS)
+def test_save_network_with_numpy_coordinates(monkeypatch, tmp_path, use_orjson):
+    """Test that nodes added with NumPy scalar attributes can be saved and loaded."""
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", use_orjson)
+    network = IoTNetwork()
+    network.add_node("A", np.float64(1), np.float64(2), np.float64(50))
+    network.add_node("B", np.float32(5), np.float32(2), np.float32(50))
+    network.update_all_connections()
+
+    network.save_to_file(tmp_path / "network.json")
+    loaded = IoTNetwork.load_from_file(tmp_path / "network.json")
+    assert loaded.to_dict() == serialization.loads(serialization.dumps(network.to_dict()))
+    assert loaded.graph.has_edge("A", "B")
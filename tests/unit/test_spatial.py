@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the fixed-radius pair search strategies.
+Checks that every strategy finds the same connected pairs.
+"""
+
+import numpy as np
+import pytest
+
+from src.iot_network_routing.core.spatial import (
+    SCIPY_AVAILABLE,
+    dense_pairs,
+    grid_pairs,
+    kdtree_pairs,
+    pairs_within_range,
+)
+
+
+def _random_layout():
+    rng = np.random.default_rng(11)
+    xs = rng.uniform(0, 500, 400)
+    ys = rng.uniform(0, 500, 400)
+    ranges_sq = rng.uniform(10, 60, 400) ** 2
+    return xs, ys, ranges_sq
+
+
+def _dense_expected(xs, ys, ranges_sq):
+    rows, cols, dists = dense_pairs(xs, ys, ranges_sq)
+    return {(i, j): d for i, j, d in zip(rows.tolist(), cols.tolist(), dists.tolist())}
+
+
+def test_pair_strategies_agree():
+    """Test that grid and dense searches return identical pairs and distances."""
+    xs, ys, ranges_sq = _random_layout()
+    expected = _dense_expected(xs, ys, ranges_sq)
+    print(f"✓ {len(expected)} pairs within range")
+
+    rows, cols, dists = grid_pairs(xs, ys, ranges_sq)
+    assert list(zip(rows.tolist(), cols.tolist())) == list(expected)
+    assert dists.tolist() == list(expected.values())
+
+
+@pytest.mark.skipif(not SCIPY_AVAILABLE, reason="scipy is not installed")
+def test_kdtree_pairs_agree():
+    """Test that the KD-tree search returns the same pairs and distances as the dense search."""
+    xs, ys, ranges_sq = _random_layout()
+    expected = _dense_expected(xs, ys, ranges_sq)
+
+    rows, cols, dists = kdtree_pairs(xs, ys, ranges_sq)
+    assert list(zip(rows.tolist(), cols.tolist())) == list(expected)
+    assert dists.tolist() == list(expected.values())
+
+
+def test_pairs_within_range_on_sparse_and_dense_maps():
+    """Test that the size- and density-based dispatch matches the dense search on both kinds of map."""
+    rng = np.random.default_rng(5)
+    for side in (200, 20000):
+        xs = rng.uniform(0, side, 3000)
+        ys = rng.uniform(0, side, 3000)
+        ranges = rng.uniform(10, 50, 3000)
+
+        expected = dense_pairs(xs, ys, ranges * ranges)
+        result = pairs_within_range(xs, ys, ranges)
+        print(f"✓ {len(result[0])} pairs on a {side}x{side} map")
+        for got, want in zip(result, expected):
+            assert got.tolist() == want.tolist()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Tests for network visualization helpers.
+Checks that cached ASCII maps follow changes to the network.
+"""
+
+from src.iot_network_routing.core.generator import generate_random_network
+from src.iot_network_routing.utils.visualization import NetworkVisualizer
+
+
+def test_ascii_map_cache_follows_network_changes():
+    """Test that repeated ascii_map calls reuse the map until a node moves."""
+    network = generate_random_network(n_nodes=30, map_width=200, map_height=200, max_range=60, seed=4)
+    visualizer = NetworkVisualizer(network)
+
+    first = visualizer.ascii_map(40, 20)
+    first.append("caller-owned")
+    assert visualizer.ascii_map(40, 20) == first[:-1]
+
+    node = network.nodes[0]
+    node.x, node.y = 1000.0, 1000.0
+    moved = visualizer.ascii_map(40, 20)
+    print(f"✓ Map redrawn after move: {moved != first[:-1]}")
+    assert moved == NetworkVisualizer(network).ascii_map(40, 20)
+    assert moved != first[:-1]